@@ -7,16 +7,40 @@ for response texts. Embeddings are cached for reuse.
 
 import numpy as np
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Union, Iterator, Tuple
+from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from sentence_transformers import SentenceTransformer
+import torch
+from tqdm import tqdm
+import importlib.util
 import json
+import os
+import shutil
 
 from .load_prompts import load_config
 
 
 # Default paths
 DEFAULT_DATA_DIR = Path(__file__).parent.parent / "data"
-DEFAULT_EMBEDDINGS_CACHE = DEFAULT_DATA_DIR / "embeddings_cache.json"
+DEFAULT_EMBEDDINGS_CACHE = DEFAULT_DATA_DIR / "embeddings_cache.json"  # Legacy JSON cache
+EMBEDDINGS_NPY = DEFAULT_DATA_DIR / "embeddings.npy"
+EMBEDDINGS_INDEX = DEFAULT_DATA_DIR / "embeddings_index.json"
+DEFAULT_ONNX_DIR = DEFAULT_DATA_DIR / "onnx"
+
+# On-disk dtype for cached embeddings (half the size of float32)
+CACHE_DTYPE = np.float16
+
+# Number of appended cache parts that triggers a compaction into one file
+MAX_CACHE_PARTS = 8
+
+# Tokenized batches kept ready ahead of the forward pass when prefetching
+PREFETCH_BATCHES = 4
+
+# Multi-process CPU encoding: minimum job size and maximum worker count
+PARALLEL_MIN_TEXTS = 512
+PARALLEL_MAX_WORKERS = 4
 
 
 # Global model cache
@@ -27,19 +51,78 @@ def get_embedding_config() -> Dict[str, Any]:
     """Get embedding configuration.
     
     Returns:
-        Dictionary with model_name, embedding_dim, normalize
+        Dictionary with model_name, embedding_dim, normalize, device,
+        torch_dtype, backend and ONNX settings
     """
     config = load_config("embeddings.yaml")
     return config.get("embedding", {
         "model_name": "sentence-transformers/LaBSE",
         "embedding_dim": 768,
-        "normalize": True
+        "normalize": True,
+        "device": None,
+        "torch_dtype": None,
+        "backend": "torch",
+        "max_seq_length": 256
     })
 
 
+def _onnx_available() -> bool:
+    """Check whether the ONNX Runtime backend dependencies are installed."""
+    return (
+        importlib.util.find_spec("onnxruntime") is not None
+        and importlib.util.find_spec("optimum") is not None
+    )
+
+
+def _load_onnx_model(model_name: str, device: str, config: Dict[str, Any]) -> SentenceTransformer:
+    """Load a SentenceTransformer on the ONNX Runtime backend.
+    
+    The exported model is saved under data/onnx/<model>/<onnx file>/ so
+    later runs load it directly instead of exporting again. A cached
+    directory is only reused if it contains the requested ONNX file;
+    otherwise it is exported again.
+    
+    Args:
+        model_name: Model identifier
+        device: Inference device
+        config: Embedding configuration
+        
+    Returns:
+        SentenceTransformer using the ONNX backend
+    """
+    provider = config.get("onnx_provider") or (
+        "CUDAExecutionProvider" if device.startswith("cuda") else "CPUExecutionProvider"
+    )
+    model_kwargs = {"provider": provider}
+    if config.get("onnx_file_name"):
+        model_kwargs["file_name"] = config["onnx_file_name"]
+    
+    # One cache directory per ONNX file; save_pretrained writes it to onnx/
+    onnx_file = Path(config.get("onnx_file_name") or "model.onnx").name
+    onnx_dir = DEFAULT_ONNX_DIR / model_name.replace("/", "__") / Path(onnx_file).stem
+    if (onnx_dir / "onnx" / onnx_file).exists() and (onnx_dir / "modules.json").exists():
+        return SentenceTransformer(str(onnx_dir), device=device, backend="onnx", model_kwargs=model_kwargs)
+    
+    model = SentenceTransformer(model_name, device=device, backend="onnx", model_kwargs=model_kwargs)
+    
+    # Save to a temporary directory first so an interrupted export is never reused
+    tmp_dir = onnx_dir.with_name(onnx_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    model.save_pretrained(str(tmp_dir))
+    shutil.rmtree(onnx_dir, ignore_errors=True)
+    os.replace(tmp_dir, onnx_dir)
+    return model
+
+
 def load_labse_model(model_name: Optional[str] = None) -> SentenceTransformer:
     """Load the LaBSE model (cached after first load).
     
+    Device and dtype are passed to the constructor rather than applied
+    with .to() afterwards, so the model's target device stays in sync.
+    With backend: onnx the model runs on ONNX Runtime, falling back to
+    PyTorch if the ONNX dependencies are not installed. Inputs are
+    truncated to max_seq_length tokens (LaBSE's own limit is 512).
+    
     Args:
         model_name: Model identifier. Defaults to config value.
         
@@ -48,13 +131,32 @@ def load_labse_model(model_name: Optional[str] = None) -> SentenceTransformer:
     """
     global _model_cache
     
+    config = get_embedding_config()
     if model_name is None:
-        config = get_embedding_config()
         model_name = config["model_name"]
     
     if model_name not in _model_cache:
-        print(f"Loading LaBSE model: {model_name}")
-        _model_cache[model_name] = SentenceTransformer(model_name)
+        device = config.get("device") or ("cuda" if torch.cuda.is_available() else "cpu")
+        backend = config.get("backend", "torch")
+        
+        if backend == "onnx" and not _onnx_available():
+            print("ONNX Runtime backend unavailable "
+                  "(pip install sentence-transformers[onnx-gpu]); using PyTorch")
+            backend = "torch"
+        
+        if backend == "onnx":
+            print(f"Loading LaBSE model: {model_name} ({device}, onnx)")
+            _model_cache[model_name] = _load_onnx_model(model_name, device, config)
+        else:
+            dtype = config.get("torch_dtype") or ("float16" if device.startswith("cuda") else "float32")
+            print(f"Loading LaBSE model: {model_name} ({device}, {dtype})")
+            _model_cache[model_name] = SentenceTransformer(
+                model_name,
+                device=device,
+                model_kwargs={"torch_dtype": dtype}
+            )
+        
+        _model_cache[model_name].max_seq_length = config.get("max_seq_length", 256)
     
     return _model_cache[model_name]
 
@@ -79,14 +181,129 @@ def embed_text(text: str, model: Optional[SentenceTransformer] = None) -> np.nda
     return np.array(embedding)
 
 
+def _encode_with_prefetch(
+    model: SentenceTransformer,
+    texts: List[str],
+    batch_size: int,
+    normalize: bool,
+    show_progress: bool
+) -> np.ndarray:
+    """Encode texts while the next batches are tokenized on a worker thread.
+    
+    Mirrors SentenceTransformer.encode (length-sorted batches, original
+    order restored), but overlaps tokenization with the forward pass.
+    A single worker is used because the fast tokenizer is not thread-safe.
+    
+    Args:
+        model: Loaded SentenceTransformer model
+        texts: List of texts to embed
+        batch_size: Number of texts per forward pass
+        normalize: L2-normalize the embeddings
+        show_progress: Show progress bar
+        
+    Returns:
+        Numpy array of shape (n_texts, embedding_dim)
+    """
+    order = np.argsort([-len(t) for t in texts], kind="stable")
+    sorted_texts = [texts[i] for i in order]
+    batches = iter([sorted_texts[i:i + batch_size] for i in range(0, len(sorted_texts), batch_size)])
+    n_batches = (len(sorted_texts) + batch_size - 1) // batch_size
+    
+    outputs = []
+    progress = tqdm(total=n_batches, desc="Batches") if show_progress else None
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pending = deque()
+        for batch in batches:
+            pending.append(pool.submit(model.tokenize, batch))
+            if len(pending) >= PREFETCH_BATCHES:
+                break
+        
+        while pending:
+            features = pending.popleft().result()
+            batch = next(batches, None)
+            if batch is not None:
+                pending.append(pool.submit(model.tokenize, batch))
+            
+            features = {k: v.to(model.device) if hasattr(v, "to") else v for k, v in features.items()}
+            with torch.inference_mode():
+                embeddings = model(features)["sentence_embedding"]
+                if normalize:
+                    embeddings = torch.nn.functional.normalize(embeddings, p=2, dim=1)
+            outputs.append(embeddings.float().cpu().numpy())
+            if progress is not None:
+                progress.update(1)
+    if progress is not None:
+        progress.close()
+    
+    sorted_embeddings = np.concatenate(outputs)
+    result = np.empty_like(sorted_embeddings)
+    result[order] = sorted_embeddings
+    return result
+
+
+def _encode_multi_process(
+    model: SentenceTransformer,
+    texts: List[str],
+    n_workers: int,
+    batch_size: int,
+    normalize: bool
+) -> np.ndarray:
+    """Encode texts with a pool of CPU worker processes.
+    
+    Each worker is limited to its share of the cores, so the workers'
+    torch thread pools do not oversubscribe the machine.
+    
+    Args:
+        model: Loaded SentenceTransformer model
+        texts: List of texts to embed
+        n_workers: Number of worker processes
+        batch_size: Number of texts per forward pass
+        normalize: L2-normalize the embeddings
+        
+    Returns:
+        Numpy array of shape (n_texts, embedding_dim)
+    """
+    threads = str(max(1, (os.cpu_count() or 1) // n_workers))
+    saved_threads = os.environ.get("OMP_NUM_THREADS")
+    os.environ["OMP_NUM_THREADS"] = threads  # Inherited by the spawned workers
+    try:
+        pool = model.start_multi_process_pool(["cpu"] * n_workers)
+    finally:
+        if saved_threads is None:
+            os.environ.pop("OMP_NUM_THREADS", None)
+        else:
+            os.environ["OMP_NUM_THREADS"] = saved_threads
+    
+    try:
+        embeddings = model.encode_multi_process(
+            texts,
+            pool,
+            batch_size=batch_size,
+            normalize_embeddings=normalize
+        )
+    finally:
+        model.stop_multi_process_pool(pool)
+    return np.asarray(embeddings)
+
+
 def embed_texts(texts: List[str], model: Optional[SentenceTransformer] = None, 
-                show_progress: bool = True) -> np.ndarray:
+                show_progress: bool = True, batch_size: int = 64,
+                prefetch: bool = False, parallel: bool = False) -> np.ndarray:
     """Generate embeddings for multiple texts.
     
+    SentenceTransformer.encode sorts texts by length before batching and
+    restores the input order afterwards, so batches hold similar-length
+    texts and little compute is spent on padding.
+    
     Args:
         texts: List of texts to embed
         model: Optional pre-loaded model
         show_progress: Show progress bar
+        batch_size: Number of texts per forward pass
+        prefetch: Tokenize upcoming batches on worker threads while the
+            model runs (mainly helps on GPU, where tokenization shows up)
+        parallel: On CPU, encode large jobs (PARALLEL_MIN_TEXTS or more
+            texts) with a pool of worker processes
         
     Returns:
         Numpy array of shape (n_texts, embedding_dim)
@@ -97,95 +314,282 @@ def embed_texts(texts: List[str], model: Optional[SentenceTransformer] = None,
     config = get_embedding_config()
     normalize = config.get("normalize", True)
     
+    n_workers = min(PARALLEL_MAX_WORKERS, (os.cpu_count() or 1) // 2)
+    if parallel and model.device.type == "cpu" and len(texts) >= PARALLEL_MIN_TEXTS and n_workers > 1:
+        return _encode_multi_process(model, texts, n_workers, batch_size, normalize)
+    
+    if prefetch and texts:
+        return _encode_with_prefetch(model, texts, batch_size, normalize, show_progress)
+    
     embeddings = model.encode(
         texts, 
+        batch_size=batch_size,
         normalize_embeddings=normalize,
-        show_progress_bar=show_progress
+        show_progress_bar=show_progress,
+        convert_to_numpy=True
     )
-    return np.array(embeddings)
+    return np.asarray(embeddings)
+
+
+def _response_key(response: Dict[str, Any]) -> str:
+    """Build the embedding key "{model_id}_{prompt_id}_{language}_{run_id}"."""
+    return f"{response['model_id']}_{response['prompt_id']}_{response['language']}_{response['run_id']}"
+
+
+class EmbeddingStore(Mapping):
+    """Embeddings held as one contiguous matrix plus a key -> row index.
+    
+    Behaves like a read-only dict of embeddings (``store[key]``, ``.get``,
+    ``.items()``), but all rows live in ``mat``, so the whole set can also
+    be used directly as a matrix. Rows looked up by key are always float32:
+    views into ``mat`` when it is float32, copies when it is the float16
+    cache matrix.
+    
+    Attributes:
+        mat: Array of shape (n_rows, embedding_dim), float32 or float16
+        index: Dictionary mapping response key to row in ``mat``
+    """
+    
+    def __init__(self, mat: np.ndarray, index: Dict[str, int]):
+        self.mat = mat
+        self.index = index
+    
+    @classmethod
+    def from_dict(cls, embeddings: Mapping) -> "EmbeddingStore":
+        """Build a store from a mapping of key -> embedding."""
+        if isinstance(embeddings, EmbeddingStore):
+            return embeddings
+        if not embeddings:
+            return cls(np.empty((0, 0), dtype=np.float32), {})
+        keys = list(embeddings.keys())
+        mat = np.stack([embeddings[k] for k in keys])
+        return cls(mat, {k: i for i, k in enumerate(keys)})
+    
+    def __getitem__(self, key: str) -> np.ndarray:
+        return np.asarray(self.mat[self.index[key]], dtype=np.float32)
+    
+    def get(self, key: str, default: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        row = self.index.get(key)
+        return default if row is None else np.asarray(self.mat[row], dtype=np.float32)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.index)
+    
+    def __len__(self) -> int:
+        return len(self.index)
+    
+    def __contains__(self, key: object) -> bool:
+        return key in self.index
+    
+    def subset(self, keys: List[str]) -> "EmbeddingStore":
+        """Copy the rows for the given keys into a new in-memory store."""
+        keys = list(dict.fromkeys(k for k in keys if k in self.index))
+        rows = [self.index[k] for k in keys]
+        return EmbeddingStore(np.asarray(self.mat[rows]), {k: i for i, k in enumerate(keys)})
+    
+    def concat(self, other: "EmbeddingStore") -> "EmbeddingStore":
+        """Return a new store with the rows of ``other`` appended."""
+        if len(self.mat) == 0:
+            return other
+        if len(other.mat) == 0:
+            return self
+        offset = len(self.mat)
+        index = dict(self.index)
+        index.update((k, offset + i) for k, i in other.index.items())
+        return EmbeddingStore(np.concatenate([self.mat, other.mat]), index)
 
 
 def embed_responses(
     responses: List[Dict[str, Any]],
     model: Optional[SentenceTransformer] = None,
     show_progress: bool = True
-) -> Dict[str, np.ndarray]:
+) -> EmbeddingStore:
     """Generate embeddings for response records.
     
+    Identical response texts (common for short discrete answers) are
+    embedded once and share a row in the returned store.
+    
     Args:
         responses: List of response records with 'response_text' field
         model: Optional pre-loaded model
         show_progress: Show progress bar
         
     Returns:
-        Dictionary mapping response key to embedding.
+        EmbeddingStore mapping response key to embedding.
         Key format: "{model_id}_{prompt_id}_{language}_{run_id}"
     """
     if model is None:
         model = load_labse_model()
     
-    # Extract texts and keys
-    texts = []
-    keys = []
-    for r in responses:
-        key = f"{r['model_id']}_{r['prompt_id']}_{r['language']}_{r['run_id']}"
-        keys.append(key)
-        texts.append(r["response_text"])
-    
-    # Generate embeddings
-    embeddings = embed_texts(texts, model, show_progress)
+    # Map each response key to the row of its (deduplicated) text
+    unique_texts: Dict[str, int] = {}
+    index = {
+        _response_key(r): unique_texts.setdefault(r["response_text"], len(unique_texts))
+        for r in responses
+    }
     
-    # Create result dictionary
-    result = {}
-    for key, embedding in zip(keys, embeddings):
-        result[key] = embedding
+    embeddings = embed_texts(list(unique_texts), model, show_progress)
     
-    return result
+    return EmbeddingStore(embeddings, index)
 
 
-def load_embeddings_cache(cache_file: Optional[Path] = None) -> Dict[str, np.ndarray]:
-    """Load cached embeddings from file.
+def _index_path(npy_path: Path) -> Path:
+    """Get the key -> row index sidecar for a .npy matrix file."""
+    return npy_path.with_name(f"{npy_path.stem}_index.json")
+
+
+def _part_paths(npy_path: Path) -> List[Path]:
+    """List appended cache parts (embeddings.part{k}.npy) in append order."""
+    parts = npy_path.parent.glob(f"{npy_path.stem}.part*.npy")
+    return sorted(parts, key=lambda p: int(p.stem.rsplit(".part", 1)[1]))
+
+
+def _resolve_cache_paths(cache_file: Optional[Path]) -> Tuple[Path, Path, Optional[Path]]:
+    """Resolve the matrix, index, and legacy JSON paths for a cache file.
     
     Args:
-        cache_file: Path to cache file
+        cache_file: Requested cache path (.npy, or a legacy .json file)
         
     Returns:
-        Dictionary mapping keys to embeddings
+        Tuple of (npy_path, index_path, legacy_json_path)
     """
     if cache_file is None:
-        cache_file = DEFAULT_EMBEDDINGS_CACHE
+        return EMBEDDINGS_NPY, EMBEDDINGS_INDEX, DEFAULT_EMBEDDINGS_CACHE
     
-    if not cache_file.exists():
-        return {}
+    if cache_file.suffix == ".json":
+        npy_path = cache_file.with_suffix(".npy")
+        legacy_path = cache_file
+    else:
+        npy_path = cache_file
+        legacy_path = None
     
-    with open(cache_file, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    return npy_path, _index_path(npy_path), legacy_path
+
+
+def _load_npy_store(npy_path: Path, index_path: Path) -> EmbeddingStore:
+    """Memory-map one .npy matrix together with its index."""
+    with open(index_path, "r", encoding="utf-8") as f:
+        index = json.load(f)
+    return EmbeddingStore(np.load(npy_path, mmap_mode="r"), index)
+
+
+def _write_npy_store(store: EmbeddingStore, npy_path: Path, index_path: Path) -> None:
+    """Write a store's matrix and index via temp files and atomic renames.
     
-    # Convert lists back to numpy arrays
-    return {k: np.array(v) for k, v in data.items()}
+    Open memory maps of a previous file stay valid and an interrupted
+    write never leaves a torn file. The index is renamed last, so a
+    matrix is only picked up once its index exists.
+    """
+    tmp_npy = npy_path.with_name(npy_path.name + ".tmp")
+    with open(tmp_npy, "wb") as f:
+        np.save(f, store.mat.astype(CACHE_DTYPE))
+    tmp_index = index_path.with_name(index_path.name + ".tmp")
+    with open(tmp_index, "w", encoding="utf-8") as f:
+        json.dump(store.index, f)
+    
+    os.replace(tmp_npy, npy_path)
+    os.replace(tmp_index, index_path)
+
+
+def load_embeddings_cache(cache_file: Optional[Path] = None) -> EmbeddingStore:
+    """Load cached embeddings from file.
+    
+    The cache is a float16 .npy matrix plus a JSON key -> row index; the
+    matrix is memory-mapped, so rows are only read from disk on access.
+    ``store.mat`` stays float16, but rows looked up by key come back as
+    float32 copies.
+    Parts appended since the last compaction are concatenated after it.
+    Legacy JSON caches are migrated to this format on first load.
+    
+    Args:
+        cache_file: Path to cache file
+        
+    Returns:
+        EmbeddingStore mapping keys to embeddings
+    """
+    npy_path, index_path, legacy_path = _resolve_cache_paths(cache_file)
+    
+    if npy_path.exists() and index_path.exists():
+        store = _load_npy_store(npy_path, index_path)
+        for part in _part_paths(npy_path):
+            if _index_path(part).exists():
+                store = store.concat(_load_npy_store(part, _index_path(part)))
+        return store
+    
+    if legacy_path is not None and legacy_path.exists():
+        with open(legacy_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        store = EmbeddingStore(
+            np.array(list(data.values()), dtype=np.float32),
+            {k: i for i, k in enumerate(data)}
+        )
+        
+        # Migrate to the binary format so later runs skip the JSON parse
+        save_embeddings_cache(store, npy_path)
+        return store
+    
+    return EmbeddingStore.from_dict({})
 
 
 def save_embeddings_cache(
-    embeddings: Dict[str, np.ndarray],
+    embeddings: Mapping,
     cache_file: Optional[Path] = None
 ) -> None:
-    """Save embeddings to cache file.
+    """Save embeddings to cache file, replacing any appended parts.
     
     Args:
-        embeddings: Dictionary mapping keys to embeddings
+        embeddings: EmbeddingStore or mapping from keys to embeddings
         cache_file: Path to cache file
     """
-    if cache_file is None:
-        cache_file = DEFAULT_EMBEDDINGS_CACHE
+    npy_path, index_path, _ = _resolve_cache_paths(cache_file)
+    
+    store = EmbeddingStore.from_dict(embeddings)
+    if len(store) == 0:
+        return
     
     # Ensure parent directory exists
-    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    npy_path.parent.mkdir(parents=True, exist_ok=True)
     
-    # Convert numpy arrays to lists for JSON serialization
-    data = {k: v.tolist() for k, v in embeddings.items()}
+    _write_npy_store(store, npy_path, index_path)
     
-    with open(cache_file, "w", encoding="utf-8") as f:
-        json.dump(data, f)
+    # The full save supersedes any parts appended since the last one
+    for part in _part_paths(npy_path):
+        _index_path(part).unlink(missing_ok=True)
+        part.unlink(missing_ok=True)
+
+
+def append_embeddings_cache(
+    embeddings: Mapping,
+    cache_file: Optional[Path] = None
+) -> int:
+    """Append new embeddings to the cache without rewriting existing rows.
+    
+    New rows go to a separate embeddings.part{k}.npy file with its own
+    index, so each append costs O(new rows) rather than O(cache size).
+    
+    Args:
+        embeddings: EmbeddingStore or mapping of new keys to embeddings
+        cache_file: Path to cache file
+        
+    Returns:
+        Number of appended parts now waiting to be compacted
+    """
+    npy_path, index_path, _ = _resolve_cache_paths(cache_file)
+    
+    store = EmbeddingStore.from_dict(embeddings)
+    if len(store) == 0:
+        return len(_part_paths(npy_path))
+    
+    if not (npy_path.exists() and index_path.exists()):
+        save_embeddings_cache(store, npy_path)
+        return 0
+    
+    parts = _part_paths(npy_path)
+    next_k = int(parts[-1].stem.rsplit(".part", 1)[1]) + 1 if parts else 1
+    part_path = npy_path.with_name(f"{npy_path.stem}.part{next_k}.npy")
+    _write_npy_store(store, part_path, _index_path(part_path))
+    
+    return len(parts) + 1
 
 
 def get_or_compute_embeddings(
@@ -193,7 +597,7 @@ def get_or_compute_embeddings(
     cache_file: Optional[Path] = None,
     model: Optional[SentenceTransformer] = None,
     show_progress: bool = True
-) -> Dict[str, np.ndarray]:
+) -> EmbeddingStore:
     """Get embeddings from cache or compute if missing.
     
     Args:
@@ -203,17 +607,14 @@ def get_or_compute_embeddings(
         show_progress: Show progress bar
         
     Returns:
-        Dictionary mapping response keys to embeddings
+        In-memory float32 EmbeddingStore for the requested responses
     """
     # Load existing cache
     cache = load_embeddings_cache(cache_file)
     
     # Find responses that need embedding
-    to_embed = []
-    for r in responses:
-        key = f"{r['model_id']}_{r['prompt_id']}_{r['language']}_{r['run_id']}"
-        if key not in cache:
-            to_embed.append(r)
+    keys = [_response_key(r) for r in responses]
+    to_embed = [r for r, key in zip(responses, keys) if key not in cache]
     
     if to_embed:
         if show_progress:
@@ -223,18 +624,16 @@ def get_or_compute_embeddings(
             model = load_labse_model()
         
         new_embeddings = embed_responses(to_embed, model, show_progress)
-        cache.update(new_embeddings)
+        cache = cache.concat(new_embeddings)
         
-        # Save updated cache
-        save_embeddings_cache(cache, cache_file)
+        # Persist only the new rows; fold the parts back into one file
+        # once enough of them have accumulated
+        if append_embeddings_cache(new_embeddings, cache_file) >= MAX_CACHE_PARTS:
+            save_embeddings_cache(cache, cache_file)
     
     # Return only embeddings for requested responses
-    result = {}
-    for r in responses:
-        key = f"{r['model_id']}_{r['prompt_id']}_{r['language']}_{r['run_id']}"
-        if key in cache:
-            result[key] = cache[key]
-    
+    result = cache.subset(keys)
+    result.mat = result.mat.astype(np.float32, copy=False)
     return result
 
 
@@ -243,7 +642,7 @@ def get_embedding_for_response(
     prompt_id: int,
     language: str,
     run_id: int,
-    embeddings: Dict[str, np.ndarray]
+    embeddings: Mapping
 ) -> Optional[np.ndarray]:
     """Get embedding for a specific response.
     
@@ -252,10 +651,10 @@ def get_embedding_for_response(
         prompt_id: Prompt ID
         language: Language code
         run_id: Run number
-        embeddings: Dictionary of embeddings
+        embeddings: EmbeddingStore or dictionary of embeddings
         
     Returns:
-        Embedding array or None if not found
+        float32 embedding array or None if not found
     """
     key = f"{model_id}_{prompt_id}_{language}_{run_id}"
     return embeddings.get(key)
@@ -5,14 +5,24 @@ This module handles all LLM inference via the Ollama local server,
 with support for multiple runs, caching, and non-compliance detection.
 """
 
+import asyncio
 import json
+import os
+import queue
+import threading
 import ollama
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Optional, List, Dict, Any, Generator
+from typing import Optional, List, Dict, Any, Generator, Iterator, Union
+from itertools import groupby
 from tqdm import tqdm
 import re
 
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON decoding
+    orjson = None
+
 from .load_prompts import load_prompts_as_list, load_config, is_discrete_task
 
 
@@ -20,18 +30,52 @@ from .load_prompts import load_prompts_as_list, load_config, is_discrete_task
 DEFAULT_DATA_DIR = Path(__file__).parent.parent / "data"
 DEFAULT_RESPONSES_FILE = DEFAULT_DATA_DIR / "responses.jsonl"
 
+# Write buffer for the responses file held open during run_inference
+WRITE_BUFFER_SIZE = 1 << 16
+
+
+# Format-compliance rules for discrete-answer prompts
+_CLASSIFICATION_LABELS = {
+    5: frozenset(["positive", "negative", "positiv", "negativ", "olumlu", "olumsuz"]),  # Sentiment
+    6: frozenset(["agree", "disagree"]),  # Agreement
+    7: frozenset(["request", "complaint"]),  # Intent
+    8: frozenset(["formal", "informal"]),  # Formality
+}
+_ABC_PROMPTS = frozenset([9, 12])
+_NUMERIC_PROMPTS = frozenset([10, 11])
+_ABC_RE = re.compile(r'\b[ABC]\b', re.IGNORECASE)
+_NUM_RE = re.compile(r'\d+')
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _dumps_line(record: Dict[str, Any]) -> bytes:
+    """Encode a record as one UTF-8 JSONL line."""
+    if orjson is not None:
+        return orjson.dumps(record) + b"\n"
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _write_record(f, record: Dict[str, Any]) -> None:
+    """Append a record to an open binary JSONL file handle."""
+    f.write(_dumps_line(record))
+
 
 def get_inference_params() -> Dict[str, Any]:
     """Get inference parameters from config.
     
     Returns:
-        Dictionary with temperature, num_predict, runs_per_prompt
+        Dictionary with temperature, num_predict, runs_per_prompt,
+        parallel_requests, fsync_every, keep_alive
     """
     config = load_config("models.yaml")
     return config.get("inference", {
         "temperature": 0.3,
         "num_predict": 256,
-        "runs_per_prompt": 2
+        "runs_per_prompt": 2,
+        "parallel_requests": 4,
+        "fsync_every": 16,
+        "keep_alive": -1
     })
 
 
@@ -45,7 +89,12 @@ def get_models() -> List[Dict[str, str]]:
     return config.get("models", [])
 
 
-def detect_non_compliance(response_text: str, task_type: str, prompt_id: int) -> bool:
+def detect_non_compliance(
+    response_text: str,
+    task_type: str,
+    prompt_id: int,
+    is_discrete: Optional[bool] = None
+) -> bool:
     """Detect if a response violates expected output FORMAT.
     
     This function only checks FORMAT compliance, not factual correctness.
@@ -61,41 +110,38 @@ def detect_non_compliance(response_text: str, task_type: str, prompt_id: int) ->
         response_text: The model's response text
         task_type: The task type of the prompt
         prompt_id: The prompt ID
+        is_discrete: Precomputed is_discrete_task(task_type), if known
         
     Returns:
         True if non-compliant (format violation), False otherwise
     """
-    text = response_text.strip()
-    text_lower = text.lower()
+    if is_discrete is None:
+        is_discrete = is_discrete_task(task_type)
     
     # Only check discrete-answer tasks for format compliance
-    if not is_discrete_task(task_type):
+    if not is_discrete:
         return False
     
+    text = response_text.strip()
+    
     # Classification checks - must have the label (multilingual support)
     if task_type == "classification":
-        if prompt_id == 5:  # Sentiment: Positive/Negative
-            valid = ["positive", "negative", "positiv", "negativ", "olumlu", "olumsuz"]
-        elif prompt_id == 6:  # Agreement: Agree/Disagree
-            valid = ["agree", "disagree"]
-        elif prompt_id == 7:  # Intent: Request/Complaint
-            valid = ["request", "complaint"]
-        elif prompt_id == 8:  # Formality: Formal/Informal
-            valid = ["formal", "informal"]
-        else:
+        valid = _CLASSIFICATION_LABELS.get(prompt_id)
+        if valid is None:
             return False
         
         # Check if response contains a valid label
+        text_lower = text.lower()
         if not any(v in text_lower for v in valid):
             return True
     
     # Reasoning checks - must have expected format
     elif task_type == "reasoning":
-        if prompt_id in [9, 12]:  # A/B/C answers
-            if not re.search(r'\b[ABC]\b', text, re.IGNORECASE):
+        if prompt_id in _ABC_PROMPTS:  # A/B/C answers
+            if not _ABC_RE.search(text):
                 return True
-        elif prompt_id in [10, 11]:  # Numeric answers
-            if not re.search(r'\d+', text):
+        elif prompt_id in _NUMERIC_PROMPTS:  # Numeric answers
+            if not _NUM_RE.search(text):
                 return True
     
     # Factual: NO FORMAT CHECK
@@ -109,7 +155,8 @@ def generate_response(
     model_id: str,
     prompt_text: str,
     temperature: float = 0.3,
-    num_predict: int = 256
+    num_predict: int = 256,
+    keep_alive: Union[int, str] = -1
 ) -> str:
     """Generate a single response from Ollama.
     
@@ -118,6 +165,7 @@ def generate_response(
         prompt_text: The full prompt text
         temperature: Sampling temperature
         num_predict: Maximum tokens to generate
+        keep_alive: How long Ollama keeps the model loaded (-1 = indefinitely)
         
     Returns:
         Generated response text
@@ -128,7 +176,8 @@ def generate_response(
         options={
             "temperature": temperature,
             "num_predict": num_predict
-        }
+        },
+        keep_alive=keep_alive
     )
     return response["response"]
 
@@ -139,7 +188,9 @@ def create_response_record(
     run_id: int,
     response_text: str,
     temperature: float,
-    num_predict: int
+    num_predict: int,
+    is_discrete: Optional[bool] = None,
+    record_template: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """Create a response record for JSONL storage.
     
@@ -150,6 +201,9 @@ def create_response_record(
         response_text: The generated response
         temperature: Temperature used
         num_predict: Max tokens setting
+        is_discrete: Precomputed is_discrete_task(prompt["task_type"]), if known
+        record_template: Precomputed {"temperature", "max_new_tokens"} fields
+            shared by every record of a run
         
     Returns:
         Complete response record dictionary
@@ -157,17 +211,20 @@ def create_response_record(
     non_compliant = detect_non_compliance(
         response_text, 
         prompt["task_type"], 
-        prompt["prompt_id"]
+        prompt["prompt_id"],
+        is_discrete
     )
     
+    if record_template is None:
+        record_template = {"temperature": temperature, "max_new_tokens": num_predict}
+    
     return {
         "prompt_id": prompt["prompt_id"],
         "task_type": prompt["task_type"],
         "language": prompt["language"],
         "model_id": model_id,
         "run_id": run_id,
-        "temperature": temperature,
-        "max_new_tokens": num_predict,
+        **record_template,
         "timestamp_utc": datetime.now(timezone.utc).isoformat(),
         "prompt_text": prompt["text"],
         "response_text": response_text,
@@ -184,16 +241,28 @@ def load_responses(responses_file: Optional[Path] = None) -> List[Dict[str, Any]
     Returns:
         List of response records
     """
+    return list(iter_responses(responses_file))
+
+
+def iter_responses(responses_file: Optional[Path] = None) -> Iterator[Dict[str, Any]]:
+    """Stream response records from the JSONL file one at a time.
+    
+    Args:
+        responses_file: Path to responses.jsonl
+        
+    Yields:
+        Response records in file order
+    """
     if responses_file is None:
         responses_file = DEFAULT_RESPONSES_FILE
     
-    responses = []
-    if responses_file.exists():
-        with open(responses_file, "r", encoding="utf-8") as f:
-            for line in f:
-                if line.strip():
-                    responses.append(json.loads(line))
-    return responses
+    if not responses_file.exists():
+        return
+    
+    with open(responses_file, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield _json_loads(line)
 
 
 def save_response(
@@ -202,6 +271,9 @@ def save_response(
 ) -> None:
     """Append a single response to the JSONL file.
     
+    Not meant for hot loops: opens and closes the file on every call,
+    whereas run_inference keeps one buffered handle open for the whole run.
+    
     Args:
         response: Response record to save
         responses_file: Path to responses.jsonl
@@ -212,8 +284,8 @@ def save_response(
     # Ensure parent directory exists
     responses_file.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(responses_file, "a", encoding="utf-8") as f:
-        f.write(json.dumps(response, ensure_ascii=False) + "\n")
+    with open(responses_file, "ab") as f:
+        _write_record(f, response)
 
 
 def get_existing_keys(responses_file: Optional[Path] = None) -> set:
@@ -225,13 +297,134 @@ def get_existing_keys(responses_file: Optional[Path] = None) -> set:
     Returns:
         Set of tuples representing existing response keys
     """
-    responses = load_responses(responses_file)
     return {
         (r["model_id"], r["prompt_id"], r["language"], r["run_id"])
-        for r in responses
+        for r in iter_responses(responses_file)
     }
 
 
+async def _run_inference_async(
+    work_items: List[Any],
+    temperature: float,
+    num_predict: int,
+    parallel_requests: int,
+    fsync_every: int,
+    keep_alive: Union[int, str],
+    responses_file: Path,
+    records: "queue.Queue",
+    stop: threading.Event
+) -> None:
+    """Generate responses for work items with bounded concurrency.
+    
+    Records are appended to the responses file by a single writer task,
+    which hands each one to the caller via the records queue only once it
+    has been written and flushed, in completion order.
+    Work items are processed one model at a time; each model is warmed up
+    once before its first request.
+    
+    Args:
+        work_items: List of (model_id, prompt, run_id) tuples, grouped by model
+        temperature: Sampling temperature
+        num_predict: Maximum tokens to generate
+        parallel_requests: Maximum number of requests in flight
+        fsync_every: Fsync the responses file every N records (the file is
+            flushed before any record is handed to the caller)
+        keep_alive: How long Ollama keeps each model loaded (-1 = indefinitely)
+        responses_file: Path to save responses
+        records: Queue receiving records after they are written and flushed
+        stop: Event set by the caller to skip remaining work items
+    """
+    client = ollama.AsyncClient()
+    
+    # Per-run invariants, computed once instead of per record
+    options = {"temperature": temperature, "num_predict": num_predict}
+    record_template = {"temperature": temperature, "max_new_tokens": num_predict}
+    prompt_is_discrete = {p["prompt_id"]: is_discrete_task(p["task_type"]) for _, p, _ in work_items}
+    
+    semaphore = asyncio.Semaphore(max(1, parallel_requests))
+    pending_writes = asyncio.Queue()
+    
+    async def generate(model_id: str, prompt: Dict[str, Any], run_id: int) -> Optional[Dict[str, Any]]:
+        async with semaphore:
+            if stop.is_set():
+                return None
+            try:
+                response = await client.generate(
+                    model=model_id,
+                    prompt=prompt["text"],
+                    options=options,
+                    keep_alive=keep_alive
+                )
+            except Exception as e:
+                print(f"Error generating response for {model_id}, prompt {prompt['prompt_id']}, "
+                      f"lang {prompt['language']}, run {run_id}: {e}")
+                return None
+        
+        return create_response_record(
+            prompt=prompt,
+            model_id=model_id,
+            run_id=run_id,
+            response_text=response["response"],
+            temperature=temperature,
+            num_predict=num_predict,
+            is_discrete=prompt_is_discrete[prompt["prompt_id"]],
+            record_template=record_template
+        )
+    
+    async def writer() -> None:
+        responses_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(responses_file, "ab", buffering=WRITE_BUFFER_SIZE) as f:
+            unsynced = 0
+            finished = False
+            while not finished:
+                # Write everything already queued, then flush once for the batch
+                batch = [await pending_writes.get()]
+                while not pending_writes.empty():
+                    batch.append(pending_writes.get_nowait())
+                if batch[-1] is None:
+                    batch.pop()
+                    finished = True
+                
+                for record in batch:
+                    _write_record(f, record)
+                f.flush()
+                
+                unsynced += len(batch)
+                if unsynced >= max(1, fsync_every):
+                    os.fsync(f.fileno())
+                    unsynced = 0
+                
+                for record in batch:
+                    records.put(record)
+            os.fsync(f.fileno())
+    
+    async def warmup(model_id: str) -> None:
+        try:
+            await client.generate(
+                model=model_id,
+                prompt=" ",
+                options={"num_predict": 1},
+                keep_alive=keep_alive
+            )
+        except Exception as e:
+            print(f"Error warming up {model_id}: {e}")
+    
+    writer_task = asyncio.create_task(writer())
+    try:
+        for model_id, items in groupby(work_items, key=lambda item: item[0]):
+            if stop.is_set():
+                break
+            await warmup(model_id)
+            tasks = [asyncio.create_task(generate(*item)) for item in items]
+            for future in asyncio.as_completed(tasks):
+                record = await future
+                if record is not None:
+                    await pending_writes.put(record)
+    finally:
+        await pending_writes.put(None)
+        await writer_task
+
+
 def run_inference(
     model_ids: Optional[List[str]] = None,
     task_types: Optional[List[str]] = None,
@@ -255,7 +448,7 @@ def run_inference(
         show_progress: Show progress bar
         
     Yields:
-        Response records as they are generated
+        Response records in completion order
     """
     # Load configuration
     params = get_inference_params()
@@ -269,6 +462,9 @@ def run_inference(
     if runs is None:
         runs = list(range(1, runs_per_prompt + 1))
     
+    if responses_file is None:
+        responses_file = DEFAULT_RESPONSES_FILE
+    
     # Load prompts
     prompts = load_prompts_as_list(
         task_type=task_types[0] if task_types and len(task_types) == 1 else None,
@@ -297,38 +493,55 @@ def run_inference(
                 if key not in existing_keys:
                     work_items.append((model_id, prompt, run_id))
     
+    # Keep each model's requests contiguous so it stays loaded in Ollama, and
+    # the runs of each prompt back-to-back so its prompt prefix can be reused
+    work_items.sort(key=lambda item: (item[0], item[1]["prompt_id"], item[1]["language"], item[2]))
+    
     if show_progress:
         print(f"Total inference calls needed: {len(work_items)} (skipped {total_calls - len(work_items)} existing)")
     
-    # Run inference
-    iterator = tqdm(work_items, desc="Generating responses") if show_progress else work_items
+    # Run inference on a background event loop (also works inside Jupyter,
+    # which already has a running loop) and stream records back
+    records = queue.Queue()
+    stop = threading.Event()
+    done = object()
+    errors = []
     
-    for model_id, prompt, run_id in iterator:
+    def worker():
         try:
-            response_text = generate_response(
-                model_id=model_id,
-                prompt_text=prompt["text"],
-                temperature=temperature,
-                num_predict=num_predict
-            )
-            
-            record = create_response_record(
-                prompt=prompt,
-                model_id=model_id,
-                run_id=run_id,
-                response_text=response_text,
-                temperature=temperature,
-                num_predict=num_predict
-            )
-            
-            # Save to file
-            save_response(record, responses_file)
-            
-            yield record
-            
+            asyncio.run(_run_inference_async(
+                work_items, temperature, num_predict,
+                params.get("parallel_requests", 4),
+                params.get("fsync_every", 16),
+                params.get("keep_alive", -1),
+                responses_file, records, stop
+            ))
         except Exception as e:
-            print(f"Error generating response for {model_id}, prompt {prompt['prompt_id']}, "
-                  f"lang {prompt['language']}, run {run_id}: {e}")
+            errors.append(e)
+        finally:
+            records.put(done)
+    
+    # Not a daemon: the writer must drain to disk even if the caller stops early
+    thread = threading.Thread(target=worker)
+    thread.start()
+    
+    progress = tqdm(total=len(work_items), desc="Generating responses") if show_progress else None
+    try:
+        while True:
+            record = records.get()
+            if record is done:
+                break
+            if progress is not None:
+                progress.update(1)
+            yield record
+    finally:
+        stop.set()
+        thread.join()
+        if progress is not None:
+            progress.close()
+    
+    if errors:
+        raise errors[0]
 
 
 def run_full_inference(
@@ -369,10 +582,8 @@ def get_responses_by_prompt(
     Returns:
         Dictionary: {language: {run_id: response_text}}
     """
-    responses = load_responses(responses_file)
-    
     result = {}
-    for r in responses:
+    for r in iter_responses(responses_file):
         if r["prompt_id"] == prompt_id:
             if model_id is None or r["model_id"] == model_id:
                 lang = r["language"]
@@ -5,11 +5,18 @@ This module provides utilities for loading prompts from prompts_primary.csv
 and filtering them by task type, language, or prompt ID.
 """
 
+import csv
 import pandas as pd
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 import yaml
 
+try:
+    from pyarrow import csv as pa_csv
+except ImportError:  # Optional: multithreaded CSV parsing
+    pa_csv = None
+
 
 # Default paths
 DEFAULT_DATA_DIR = Path(__file__).parent.parent / "data"
@@ -17,8 +24,12 @@ DEFAULT_PROMPTS_FILE = DEFAULT_DATA_DIR / "prompts_primary.csv"
 DEFAULT_CONFIG_DIR = Path(__file__).parent.parent / "configs"
 
 
+@lru_cache(maxsize=8)
 def load_config(config_name: str = "models.yaml") -> Dict[str, Any]:
-    """Load a YAML configuration file.
+    """Load a YAML configuration file (cached after first load).
+    
+    The returned dictionary is shared between callers and must not be
+    modified. Call load_config.cache_clear() after editing a config file.
     
     Args:
         config_name: Name of the config file (models.yaml or embeddings.yaml)
@@ -31,6 +42,7 @@ def load_config(config_name: str = "models.yaml") -> Dict[str, Any]:
         return yaml.safe_load(f)
 
 
+@lru_cache(maxsize=8)
 def get_control_line(language: str) -> str:
     """Get the response control line for a given language.
     
@@ -45,6 +57,40 @@ def get_control_line(language: str) -> str:
     return control_lines.get(language, "")
 
 
+@lru_cache(maxsize=4)
+def _read_prompts(path: str, mtime: float) -> pd.DataFrame:
+    """Parse a prompts CSV (cached per path and modification time).
+    
+    Args:
+        path: Path to the prompts CSV file
+        mtime: File modification time, so edits invalidate the cache
+        
+    Returns:
+        DataFrame with columns: prompt_id, task_type, language, text
+    """
+    if pa_csv is not None:
+        return pa_csv.read_csv(path).to_pandas()
+    return pd.read_csv(path)
+
+
+@lru_cache(maxsize=4)
+def _read_prompt_rows(path: str, mtime: float) -> Tuple[Dict[str, Any], ...]:
+    """Parse a prompts CSV into row dicts (cached per path and modification time).
+    
+    Args:
+        path: Path to the prompts CSV file
+        mtime: File modification time, so edits invalidate the cache
+        
+    Returns:
+        Tuple of dictionaries with keys: prompt_id, task_type, language, text
+    """
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    for row in rows:
+        row["prompt_id"] = int(row["prompt_id"])
+    return tuple(rows)
+
+
 def load_prompts(
     prompts_file: Optional[Path] = None,
     task_type: Optional[str] = None,
@@ -67,7 +113,8 @@ def load_prompts(
     if prompts_file is None:
         prompts_file = DEFAULT_PROMPTS_FILE
     
-    df = pd.read_csv(prompts_file)
+    prompts_file = Path(prompts_file)
+    df = _read_prompts(str(prompts_file), prompts_file.stat().st_mtime).copy()
     
     # Apply filters
     if task_type is not None:
@@ -81,11 +128,8 @@ def load_prompts(
     
     # Prepend control lines if requested
     if prepend_control_line:
-        df = df.copy()
-        df["text"] = df.apply(
-            lambda row: f"{get_control_line(row['language'])}\n\n{row['text']}", 
-            axis=1
-        )
+        control_lines = load_config("models.yaml").get("control_lines", {})
+        df["text"] = df["language"].map(control_lines).fillna("") + "\n\n" + df["text"]
     
     return df.reset_index(drop=True)
 
@@ -109,14 +153,28 @@ def load_prompts_as_list(
     Returns:
         List of dictionaries with keys: prompt_id, task_type, language, text
     """
-    df = load_prompts(
-        prompts_file=prompts_file,
-        task_type=task_type,
-        language=language,
-        prompt_ids=prompt_ids,
-        prepend_control_line=prepend_control_line
-    )
-    return df.to_dict(orient="records")
+    if prompts_file is None:
+        prompts_file = DEFAULT_PROMPTS_FILE
+    
+    prompts_file = Path(prompts_file)
+    rows = _read_prompt_rows(str(prompts_file), prompts_file.stat().st_mtime)
+    
+    # Apply filters
+    prompt_id_set = set(prompt_ids) if prompt_ids is not None else None
+    rows = [
+        dict(r) for r in rows
+        if (task_type is None or r["task_type"] == task_type)
+        and (language is None or r["language"] == language)
+        and (prompt_id_set is None or r["prompt_id"] in prompt_id_set)
+    ]
+    
+    # Prepend control lines if requested
+    if prepend_control_line:
+        control_lines = load_config("models.yaml").get("control_lines", {})
+        for r in rows:
+            r["text"] = f"{control_lines.get(r['language'], '')}\n\n{r['text']}"
+    
+    return rows
 
 
 def get_task_types() -> List[str]:
@@ -152,6 +210,7 @@ def get_prompt_ids_by_task_type(task_type: str) -> List[int]:
     return sorted(df["prompt_id"].unique().tolist())
 
 
+@lru_cache(maxsize=None)
 def is_open_text_task(task_type: str) -> bool:
     """Check if a task type is open-text (uses LaBSE similarity).
     
@@ -164,6 +223,7 @@ def is_open_text_task(task_type: str) -> bool:
     return task_type in ["summarization", "creative"]
 
 
+@lru_cache(maxsize=None)
 def is_discrete_task(task_type: str) -> bool:
     """Check if a task type is discrete-answer (uses exact match).
     
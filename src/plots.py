@@ -5,14 +5,20 @@ This module generates heatmaps, distribution plots, and summary tables
 for the evaluation results.
 """
 
+import os
 import numpy as np
 import pandas as pd
+import matplotlib
 import matplotlib.pyplot as plt
 import seaborn as sns
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Tuple, Sequence
 
-from .similarity import load_metrics, load_stability, aggregate_by_language_pair, aggregate_by_task_type
+from .similarity import (
+    LANGUAGE_PAIRS, load_metrics, load_stability, aggregate_by_language_pair, aggregate_by_task_type
+)
 from .task_checks import load_task_metrics, aggregate_task_metrics_by_task_type
 
 
@@ -32,11 +38,58 @@ PLOT_STYLE = {
     "ytick.labelsize": 10,
 }
 
+_STYLE_APPLIED = False
+
+# Qualitative palettes, resolved once instead of by name on every plot
+PALETTE_SET1 = sns.color_palette("Set1", n_colors=16)
+PALETTE_SET2 = sns.color_palette("Set2", n_colors=16)
+PALETTE_SET3 = sns.color_palette("Set3", n_colors=16)
+
+# Low-cardinality string columns used for grouping and plotting
+CATEGORICAL_COLUMNS = ["model_id", "pair", "task_type", "language", "stability_type", "result"]
+
+# Category order of the language columns (EN-DE, EN-TR, DE-TR / EN, DE, TR);
+# the other categorical columns are sorted
+CATEGORY_ORDERS = {
+    "pair": [f"{lang1}-{lang2}" for lang1, lang2 in LANGUAGE_PAIRS],
+    "language": list(dict.fromkeys(lang for pair in LANGUAGE_PAIRS for lang in pair)),
+}
+
 
 def setup_plot_style():
-    """Set up consistent plot styling."""
+    """Set up consistent plot styling (applied once per session)."""
+    global _STYLE_APPLIED
+    if _STYLE_APPLIED:
+        return
     plt.rcParams.update(PLOT_STYLE)
     sns.set_theme(style="whitegrid")
+    _STYLE_APPLIED = True
+
+
+def _palette(colors: List[Tuple[float, float, float]], values: pd.Series) -> List[Tuple[float, float, float]]:
+    """Slice a precomputed palette to the number of levels seaborn draws for values."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return colors[:len(values.cat.categories)]
+    return colors[:values.nunique()]
+
+
+def _select_model(df: pd.DataFrame, model_id: str, pre_filtered: bool) -> pd.DataFrame:
+    """Return the rows of df belonging to model_id."""
+    return df if pre_filtered else df[df["model_id"] == model_id]
+
+
+def _finish_figure(fig: plt.Figure, save_path: Optional[Path], show: bool) -> None:
+    """Lay out a standalone figure, then save, show, or close it."""
+    fig.tight_layout()
+    
+    if save_path:
+        save_path.parent.mkdir(parents=True, exist_ok=True)
+        fig.savefig(save_path, dpi=150)
+    
+    if show:
+        plt.show()
+    else:
+        plt.close(fig)
 
 
 def create_similarity_heatmap(
@@ -44,7 +97,9 @@ def create_similarity_heatmap(
     model_id: str,
     run_id: Optional[int] = None,
     save_path: Optional[Path] = None,
-    show: bool = True
+    show: bool = True,
+    pre_filtered: bool = False,
+    ax: Optional[plt.Axes] = None
 ) -> plt.Figure:
     """Create a heatmap of cross-lingual similarities by prompt.
     
@@ -54,27 +109,30 @@ def create_similarity_heatmap(
         run_id: Optional run filter (if None, averages across runs)
         save_path: Path to save the figure
         show: Whether to display the plot
+        pre_filtered: Whether metrics_df already only contains rows for model_id
+        ax: Axes to draw into (e.g. a dashboard panel); the caller then
+            handles layout, saving, and display
         
     Returns:
         Matplotlib Figure object
     """
     setup_plot_style()
     
-    df = metrics_df[metrics_df["model_id"] == model_id].copy()
+    df = _select_model(metrics_df, model_id, pre_filtered)
     
     if run_id is not None:
         df = df[df["run_id"] == run_id]
     
     # Pivot to create heatmap data
-    pivot_df = df.pivot_table(
-        index="prompt_id",
-        columns="pair",
-        values="cosine_similarity",
-        aggfunc="mean"
-    )
+    pivot_df = df.groupby(["prompt_id", "pair"], observed=True)["cosine_similarity"].mean().unstack("pair")
+    pivot_df = pivot_df[sorted(pivot_df.columns)]  # Alphabetical pair columns, as before
     
     # Create figure
-    fig, ax = plt.subplots(figsize=(10, 12))
+    standalone = ax is None
+    if standalone:
+        fig, ax = plt.subplots(figsize=(10, 12))
+    else:
+        fig = ax.figure
     
     # Create heatmap
     sns.heatmap(
@@ -87,22 +145,16 @@ def create_similarity_heatmap(
         ax=ax,
         cbar_kws={"label": "Cosine Similarity"}
     )
+    # Draw the cell grid as one image in vector exports (PDF/SVG)
+    ax.collections[0].set_rasterized(True)
     
     run_str = f" (Run {run_id})" if run_id else " (Averaged)"
     ax.set_title(f"Cross-Lingual Similarity Heatmap\n{model_id}{run_str}")
     ax.set_xlabel("Language Pair")
     ax.set_ylabel("Prompt ID")
     
-    plt.tight_layout()
-    
-    if save_path:
-        save_path.parent.mkdir(parents=True, exist_ok=True)
-        fig.savefig(save_path, dpi=150, bbox_inches="tight")
-    
-    if show:
-        plt.show()
-    else:
-        plt.close()
+    if standalone:
+        _finish_figure(fig, save_path, show)
     
     return fig
 
@@ -111,7 +163,9 @@ def create_similarity_distribution(
     metrics_df: pd.DataFrame,
     model_id: str,
     save_path: Optional[Path] = None,
-    show: bool = True
+    show: bool = True,
+    pre_filtered: bool = False,
+    axes: Optional[Sequence[plt.Axes]] = None
 ) -> plt.Figure:
     """Create distribution plots of similarities by language pair.
     
@@ -120,52 +174,55 @@ def create_similarity_distribution(
         model_id: Model to visualize
         save_path: Path to save the figure
         show: Whether to display the plot
+        pre_filtered: Whether metrics_df already only contains rows for model_id
+        axes: Pair of axes to draw into; the caller then handles layout,
+            saving, and display
         
     Returns:
         Matplotlib Figure object
     """
     setup_plot_style()
     
-    df = metrics_df[metrics_df["model_id"] == model_id].copy()
+    df = _select_model(metrics_df, model_id, pre_filtered)
     
-    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+    # Pair means also fix the pair order shared by both subplots
+    means = df.groupby("pair", observed=True)["cosine_similarity"].mean()
+    pairs = means.index.tolist()
+    
+    standalone = axes is None
+    if standalone:
+        fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+    else:
+        fig = axes[0].figure
     
     # Boxplot
     ax1 = axes[0]
-    sns.boxplot(data=df, x="pair", y="cosine_similarity", ax=ax1, palette="Set2")
+    sns.boxplot(data=df, x="pair", y="cosine_similarity", order=pairs, ax=ax1,
+                palette=PALETTE_SET2[:len(pairs)])
     ax1.set_title(f"Similarity Distribution by Language Pair\n{model_id}")
     ax1.set_xlabel("Language Pair")
     ax1.set_ylabel("Cosine Similarity")
     ax1.set_ylim(0, 1)
     
     # Add mean markers
-    means = df.groupby("pair")["cosine_similarity"].mean()
-    for i, pair in enumerate(means.index):
-        ax1.scatter(i, means[pair], color="red", s=100, zorder=5, marker="D", label="Mean" if i == 0 else "")
+    ax1.scatter(np.arange(len(means)), means.to_numpy(), color="red", s=100, zorder=5, marker="D", label="Mean")
     ax1.legend(loc="lower right")
     
     # KDE plot
     ax2 = axes[1]
-    for pair in df["pair"].unique():
-        pair_data = df[df["pair"] == pair]["cosine_similarity"]
-        sns.kdeplot(data=pair_data, ax=ax2, label=pair, fill=True, alpha=0.3)
+    sns.kdeplot(data=df, x="cosine_similarity", hue="pair", hue_order=pairs, ax=ax2, fill=True, alpha=0.3,
+                common_norm=False)
     
     ax2.set_title(f"Similarity Density by Language Pair\n{model_id}")
     ax2.set_xlabel("Cosine Similarity")
     ax2.set_ylabel("Density")
     ax2.set_xlim(0, 1)
-    ax2.legend()
+    legend = ax2.get_legend()
+    if legend is not None:
+        legend.set_title(None)
     
-    plt.tight_layout()
-    
-    if save_path:
-        save_path.parent.mkdir(parents=True, exist_ok=True)
-        fig.savefig(save_path, dpi=150, bbox_inches="tight")
-    
-    if show:
-        plt.show()
-    else:
-        plt.close()
+    if standalone:
+        _finish_figure(fig, save_path, show)
     
     return fig
 
@@ -174,7 +231,9 @@ def create_task_type_comparison(
     metrics_df: pd.DataFrame,
     model_id: str,
     save_path: Optional[Path] = None,
-    show: bool = True
+    show: bool = True,
+    pre_filtered: bool = False,
+    ax: Optional[plt.Axes] = None
 ) -> plt.Figure:
     """Create comparison plot of similarities by task type.
     
@@ -183,17 +242,25 @@ def create_task_type_comparison(
         model_id: Model to visualize
         save_path: Path to save the figure
         show: Whether to display the plot
+        pre_filtered: Whether metrics_df already only contains rows for model_id
+        ax: Axes to draw into; the caller then handles layout, saving,
+            and display
         
     Returns:
         Matplotlib Figure object
     """
     setup_plot_style()
     
-    df = metrics_df[metrics_df["model_id"] == model_id].copy()
+    df = _select_model(metrics_df, model_id, pre_filtered)
     
-    fig, ax = plt.subplots(figsize=(10, 6))
+    standalone = ax is None
+    if standalone:
+        fig, ax = plt.subplots(figsize=(10, 6))
+    else:
+        fig = ax.figure
     
-    sns.boxplot(data=df, x="task_type", y="cosine_similarity", hue="pair", ax=ax, palette="Set2")
+    sns.boxplot(data=df, x="task_type", y="cosine_similarity", hue="pair", ax=ax,
+                order=list(df["task_type"].unique()), palette=_palette(PALETTE_SET2, df["pair"]))
     
     ax.set_title(f"Similarity by Task Type and Language Pair\n{model_id}")
     ax.set_xlabel("Task Type")
@@ -201,16 +268,8 @@ def create_task_type_comparison(
     ax.set_ylim(0, 1)
     ax.legend(title="Language Pair", loc="lower right")
     
-    plt.tight_layout()
-    
-    if save_path:
-        save_path.parent.mkdir(parents=True, exist_ok=True)
-        fig.savefig(save_path, dpi=150, bbox_inches="tight")
-    
-    if show:
-        plt.show()
-    else:
-        plt.close()
+    if standalone:
+        _finish_figure(fig, save_path, show)
     
     return fig
 
@@ -220,7 +279,9 @@ def create_stability_comparison(
     metrics_df: pd.DataFrame,
     model_id: str,
     save_path: Optional[Path] = None,
-    show: bool = True
+    show: bool = True,
+    pre_filtered: bool = False,
+    axes: Optional[Sequence[plt.Axes]] = None
 ) -> plt.Figure:
     """Create comparison of cross-lingual vs intra-language stability.
     
@@ -230,6 +291,9 @@ def create_stability_comparison(
         model_id: Model to visualize
         save_path: Path to save the figure
         show: Whether to display the plot
+        pre_filtered: Whether both DataFrames already only contain rows for model_id
+        axes: Pair of axes to draw into; the caller then handles layout,
+            saving, and display
         
     Returns:
         Matplotlib Figure object
@@ -237,19 +301,21 @@ def create_stability_comparison(
     setup_plot_style()
     
     # Filter data
-    stab_df = stability_df[
-        (stability_df["model_id"] == model_id) & 
-        (stability_df["stability_type"] == "open_text_cosine")
-    ].copy()
-    
-    met_df = metrics_df[metrics_df["model_id"] == model_id].copy()
+    stab_df = _select_model(stability_df, model_id, pre_filtered)
+    stab_df = stab_df[stab_df["stability_type"] == "open_text_cosine"]
+    met_df = _select_model(metrics_df, model_id, pre_filtered)
     
-    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+    standalone = axes is None
+    if standalone:
+        fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+    else:
+        fig = axes[0].figure
     
     # Intra-language stability
     ax1 = axes[0]
     if len(stab_df) > 0:
-        sns.boxplot(data=stab_df, x="language", y="stability_value", ax=ax1, palette="Set3")
+        sns.boxplot(data=stab_df, x="language", y="stability_value", ax=ax1,
+                    palette=_palette(PALETTE_SET3, stab_df["language"]))
         ax1.set_title(f"Intra-Language Stability (Run1 vs Run2)\n{model_id}")
         ax1.set_xlabel("Language")
         ax1.set_ylabel("Cosine Similarity")
@@ -261,7 +327,8 @@ def create_stability_comparison(
     # Cross-lingual consistency
     ax2 = axes[1]
     if len(met_df) > 0:
-        sns.boxplot(data=met_df, x="pair", y="cosine_similarity", ax=ax2, palette="Set2")
+        sns.boxplot(data=met_df, x="pair", y="cosine_similarity", ax=ax2,
+                    palette=_palette(PALETTE_SET2, met_df["pair"]))
         ax2.set_title(f"Cross-Lingual Consistency\n{model_id}")
         ax2.set_xlabel("Language Pair")
         ax2.set_ylabel("Cosine Similarity")
@@ -270,16 +337,8 @@ def create_stability_comparison(
         ax2.text(0.5, 0.5, "No metrics data available", ha="center", va="center", transform=ax2.transAxes)
         ax2.set_title(f"Cross-Lingual Consistency\n{model_id}")
     
-    plt.tight_layout()
-    
-    if save_path:
-        save_path.parent.mkdir(parents=True, exist_ok=True)
-        fig.savefig(save_path, dpi=150, bbox_inches="tight")
-    
-    if show:
-        plt.show()
-    else:
-        plt.close()
+    if standalone:
+        _finish_figure(fig, save_path, show)
     
     return fig
 
@@ -288,7 +347,9 @@ def create_discrete_task_summary(
     task_metrics_df: pd.DataFrame,
     model_id: str,
     save_path: Optional[Path] = None,
-    show: bool = True
+    show: bool = True,
+    pre_filtered: bool = False,
+    axes: Optional[Sequence[plt.Axes]] = None
 ) -> plt.Figure:
     """Create summary visualization for discrete-answer task agreement.
     
@@ -297,25 +358,38 @@ def create_discrete_task_summary(
         model_id: Model to visualize
         save_path: Path to save the figure
         show: Whether to display the plot
+        pre_filtered: Whether task_metrics_df already only contains rows for model_id
+        axes: Pair of axes to draw into; the caller then handles layout,
+            saving, and display
         
     Returns:
         Matplotlib Figure object
     """
     setup_plot_style()
     
-    df = task_metrics_df[task_metrics_df["model_id"] == model_id].copy()
+    df = _select_model(task_metrics_df, model_id, pre_filtered)
+    standalone = axes is None
     
     if len(df) == 0:
-        fig, ax = plt.subplots(figsize=(10, 6))
+        if standalone:
+            fig, ax = plt.subplots(figsize=(10, 6))
+        else:
+            ax = axes[0]
+            fig = ax.figure
         ax.text(0.5, 0.5, "No discrete task data available", ha="center", va="center", transform=ax.transAxes)
+        if standalone and not show:
+            plt.close(fig)
         return fig
     
-    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+    if standalone:
+        fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+    else:
+        fig = axes[0].figure
     
     # Match rates by task type
     ax1 = axes[0]
-    task_summary = df.groupby("task_type")["result"].value_counts().unstack(fill_value=0)
-    task_summary_pct = task_summary.div(task_summary.sum(axis=1), axis=0) * 100
+    task_summary = pd.crosstab(df["task_type"], df["result"])
+    task_summary_pct = task_summary.div(task_summary.sum(axis=1), axis=0).mul(100)
     
     task_summary_pct.plot(kind="bar", stacked=True, ax=ax1, color=["#2ecc71", "#e74c3c", "#95a5a6"])
     ax1.set_title(f"Cross-Lingual Agreement by Task Type\n{model_id}")
@@ -326,11 +400,10 @@ def create_discrete_task_summary(
     
     # Match rates by prompt
     ax2 = axes[1]
-    prompt_summary = df.groupby("prompt_id")["result"].apply(
-        lambda x: (x == "match").sum() / len(x) * 100
-    )
+    prompt_summary = df["result"].eq("match").groupby(df["prompt_id"]).mean().mul(100)
     
-    colors = ["#2ecc71" if v >= 75 else "#f39c12" if v >= 50 else "#e74c3c" for v in prompt_summary.values]
+    rates = prompt_summary.to_numpy()
+    colors = np.select([rates >= 75, rates >= 50], ["#2ecc71", "#f39c12"], default="#e74c3c")
     prompt_summary.plot(kind="bar", ax=ax2, color=colors)
     ax2.set_title(f"Cross-Lingual Match Rate by Prompt\n{model_id}")
     ax2.set_xlabel("Prompt ID")
@@ -340,16 +413,66 @@ def create_discrete_task_summary(
     ax2.axhline(y=50, color="orange", linestyle="--", alpha=0.7, label="50%")
     ax2.legend()
     
-    plt.tight_layout()
+    if standalone:
+        _finish_figure(fig, save_path, show)
     
-    if save_path:
-        save_path.parent.mkdir(parents=True, exist_ok=True)
-        fig.savefig(save_path, dpi=150, bbox_inches="tight")
+    return fig
+
+
+def create_model_dashboard(
+    model_id: str,
+    metrics_df: pd.DataFrame,
+    task_metrics_df: pd.DataFrame,
+    stability_df: pd.DataFrame,
+    save_path: Optional[Path] = None,
+    show: bool = True,
+    pre_filtered: bool = False
+) -> plt.Figure:
+    """Create all per-model plots as panels of a single figure.
     
-    if show:
-        plt.show()
-    else:
-        plt.close()
+    Combines the heatmap, task type comparison, similarity distribution,
+    stability comparison and (if available) discrete task summary, so a
+    model needs one figure and one savefig call instead of five.
+    
+    Args:
+        model_id: Model to visualize
+        metrics_df: Metrics DataFrame (open-text)
+        task_metrics_df: Task metrics DataFrame (discrete)
+        stability_df: Stability DataFrame
+        save_path: Path to save the figure
+        show: Whether to display the plot
+        pre_filtered: Whether the DataFrames already only contain rows for model_id
+        
+    Returns:
+        Matplotlib Figure object
+    """
+    setup_plot_style()
+    
+    met_df = _select_model(metrics_df, model_id, pre_filtered)
+    task_df = _select_model(task_metrics_df, model_id, pre_filtered)
+    stab_df = _select_model(stability_df, model_id, pre_filtered)
+    
+    has_discrete = len(task_df) > 0
+    n_rows = 4 if has_discrete else 3
+    height_ratios = [2] + [1] * (n_rows - 1)
+    
+    fig = plt.figure(figsize=(16, 5 * sum(height_ratios)))
+    grid = fig.add_gridspec(n_rows, 2, height_ratios=height_ratios)
+    
+    create_similarity_heatmap(met_df, model_id, pre_filtered=True, ax=fig.add_subplot(grid[0, 0]))
+    create_task_type_comparison(met_df, model_id, pre_filtered=True, ax=fig.add_subplot(grid[0, 1]))
+    create_similarity_distribution(
+        met_df, model_id, pre_filtered=True, axes=[fig.add_subplot(grid[1, 0]), fig.add_subplot(grid[1, 1])]
+    )
+    create_stability_comparison(
+        stab_df, met_df, model_id, pre_filtered=True, axes=[fig.add_subplot(grid[2, 0]), fig.add_subplot(grid[2, 1])]
+    )
+    if has_discrete:
+        create_discrete_task_summary(
+            task_df, model_id, pre_filtered=True, axes=[fig.add_subplot(grid[3, 0]), fig.add_subplot(grid[3, 1])]
+        )
+    
+    _finish_figure(fig, save_path, show)
     
     return fig
 
@@ -373,7 +496,8 @@ def create_model_comparison(
     
     fig, ax = plt.subplots(figsize=(12, 6))
     
-    sns.boxplot(data=metrics_df, x="pair", y="cosine_similarity", hue="model_id", ax=ax, palette="Set1")
+    sns.boxplot(data=metrics_df, x="pair", y="cosine_similarity", hue="model_id", ax=ax,
+                palette=_palette(PALETTE_SET1, metrics_df["model_id"]))
     
     ax.set_title("Cross-Lingual Similarity Comparison Across Models")
     ax.set_xlabel("Language Pair")
@@ -381,16 +505,7 @@ def create_model_comparison(
     ax.set_ylim(0, 1)
     ax.legend(title="Model", loc="lower right")
     
-    plt.tight_layout()
-    
-    if save_path:
-        save_path.parent.mkdir(parents=True, exist_ok=True)
-        fig.savefig(save_path, dpi=150, bbox_inches="tight")
-    
-    if show:
-        plt.show()
-    else:
-        plt.close()
+    _finish_figure(fig, save_path, show)
     
     return fig
 
@@ -399,7 +514,8 @@ def generate_summary_table(
     metrics_df: pd.DataFrame,
     task_metrics_df: pd.DataFrame,
     stability_df: pd.DataFrame,
-    model_id: str
+    model_id: str,
+    pre_filtered: bool = False
 ) -> pd.DataFrame:
     """Generate a comprehensive summary table.
     
@@ -408,55 +524,48 @@ def generate_summary_table(
         task_metrics_df: Task metrics DataFrame (discrete)
         stability_df: Stability DataFrame
         model_id: Model to summarize
+        pre_filtered: Whether the DataFrames already only contain rows for model_id
         
     Returns:
         Summary DataFrame
     """
-    rows = []
+    summary = {"Category": [], "Metric": [], "Mean": [], "Std": [], "Count": []}
     
     # Open-text metrics by language pair
-    met_df = metrics_df[metrics_df["model_id"] == model_id]
+    met_df = metrics_df if pre_filtered else metrics_df[metrics_df["model_id"] == model_id]
     if len(met_df) > 0:
-        for pair in met_df["pair"].unique():
-            pair_data = met_df[met_df["pair"] == pair]["cosine_similarity"]
-            rows.append({
-                "Category": "Cross-Lingual (Open-Text)",
-                "Metric": f"{pair} Similarity",
-                "Mean": pair_data.mean(),
-                "Std": pair_data.std(),
-                "Count": len(pair_data)
-            })
+        pair_stats = met_df.groupby("pair", observed=True, sort=False)["cosine_similarity"].agg(["mean", "std", "count"])
+        summary["Category"] += ["Cross-Lingual (Open-Text)"] * len(pair_stats)
+        summary["Metric"] += [f"{pair} Similarity" for pair in pair_stats.index]
+        summary["Mean"] += pair_stats["mean"].tolist()
+        summary["Std"] += pair_stats["std"].tolist()
+        summary["Count"] += pair_stats["count"].tolist()
     
     # Discrete task metrics
-    task_df = task_metrics_df[task_metrics_df["model_id"] == model_id]
+    task_df = task_metrics_df if pre_filtered else task_metrics_df[task_metrics_df["model_id"] == model_id]
     if len(task_df) > 0:
-        for task_type in task_df["task_type"].unique():
-            type_data = task_df[task_df["task_type"] == task_type]
-            match_rate = (type_data["result"] == "match").sum() / len(type_data)
-            rows.append({
-                "Category": "Cross-Lingual (Discrete)",
-                "Metric": f"{task_type.capitalize()} Match Rate",
-                "Mean": match_rate,
-                "Std": None,
-                "Count": len(type_data)
-            })
+        is_match = task_df["result"].eq("match")
+        type_stats = is_match.groupby(task_df["task_type"], observed=True, sort=False).agg(["mean", "size"])
+        summary["Category"] += ["Cross-Lingual (Discrete)"] * len(type_stats)
+        summary["Metric"] += [f"{task_type.capitalize()} Match Rate" for task_type in type_stats.index]
+        summary["Mean"] += type_stats["mean"].tolist()
+        summary["Std"] += [None] * len(type_stats)
+        summary["Count"] += type_stats["size"].tolist()
     
     # Stability metrics
-    stab_df = stability_df[stability_df["model_id"] == model_id]
+    stab_df = stability_df if pre_filtered else stability_df[stability_df["model_id"] == model_id]
     if len(stab_df) > 0:
-        for stab_type in stab_df["stability_type"].unique():
-            for lang in stab_df["language"].unique():
-                lang_data = stab_df[(stab_df["stability_type"] == stab_type) & (stab_df["language"] == lang)]
-                if len(lang_data) > 0:
-                    rows.append({
-                        "Category": f"Stability ({stab_type})",
-                        "Metric": f"{lang} Run1-vs-Run2",
-                        "Mean": lang_data["stability_value"].mean(),
-                        "Std": lang_data["stability_value"].std(),
-                        "Count": len(lang_data)
-                    })
-    
-    return pd.DataFrame(rows)
+        # Stability types in order of appearance, languages in category order
+        stab_stats = stab_df.groupby(["stability_type", "language"], observed=True)["stability_value"].agg(
+            ["mean", "std", "count"]
+        ).reindex(list(stab_df["stability_type"].unique()), level=0)
+        summary["Category"] += [f"Stability ({stab_type})" for stab_type, _ in stab_stats.index]
+        summary["Metric"] += [f"{lang} Run1-vs-Run2" for _, lang in stab_stats.index]
+        summary["Mean"] += stab_stats["mean"].tolist()
+        summary["Std"] += stab_stats["std"].tolist()
+        summary["Count"] += stab_stats["count"].tolist()
+    
+    return pd.DataFrame(summary)
 
 
 def save_summary_table(
@@ -487,16 +596,156 @@ def save_summary_table(
     return filepath
 
 
+# Built-in matplotlib backends that never open windows
+_NON_INTERACTIVE_BACKENDS = {"agg", "cairo", "pdf", "pgf", "ps", "svg", "template"}
+
+
+@contextmanager
+def _headless_backend(enabled: bool):
+    """Temporarily render with the non-interactive Agg backend.
+    
+    Switching backends closes every open figure, so the switch is skipped
+    (and the current backend used) when the caller has figures open.
+    """
+    previous = plt.get_backend()
+    if not enabled or previous.lower() in _NON_INTERACTIVE_BACKENDS or plt.get_fignums():
+        yield
+        return
+    plt.switch_backend("Agg")
+    try:
+        yield
+    finally:
+        plt.switch_backend(previous)
+
+
+def _categorize(df: pd.DataFrame, cols: List[str]) -> pd.DataFrame:
+    """Return a copy of df with the given string columns as categoricals.
+    
+    Columns in CATEGORY_ORDERS keep the configured language order (values
+    outside it come last, sorted); all other columns are sorted.
+    """
+    present = [c for c in cols if c in df.columns and not isinstance(df[c].dtype, pd.CategoricalDtype)]
+    if not present:
+        return df
+    
+    dtypes = {}
+    for col in present:
+        order = CATEGORY_ORDERS.get(col)
+        if order is None:
+            dtypes[col] = "category"
+            continue
+        values = set(df[col].dropna().unique())
+        categories = [v for v in order if v in values] + sorted(values.difference(order))
+        dtypes[col] = pd.CategoricalDtype(categories)
+    return df.astype(dtypes)
+
+
+def _group_by_model(df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """Split a DataFrame into per-model sub-frames in a single pass."""
+    if len(df) == 0:
+        return {}
+    return dict(list(df.groupby("model_id", observed=True, sort=False)))
+
+
+def _init_plot_worker() -> None:
+    """Prepare a worker process for off-screen plotting."""
+    matplotlib.use("Agg")
+    setup_plot_style()
+
+
+def _render_one_model(
+    model_id: str,
+    model_metrics: pd.DataFrame,
+    model_tasks: pd.DataFrame,
+    model_stability: pd.DataFrame,
+    plots_dir: Path,
+    reports_dir: Path,
+    show: bool = False,
+    dashboard: bool = False
+) -> Dict[str, List[Path]]:
+    """Create and save all plots and the summary table for one model.
+    
+    Args:
+        model_id: Model to render
+        model_metrics: Metrics rows for this model
+        model_tasks: Task metrics rows for this model
+        model_stability: Stability rows for this model
+        plots_dir: Directory for plots
+        reports_dir: Directory for reports
+        show: Whether to display plots
+        dashboard: Save one combined dashboard instead of separate plots
+        
+    Returns:
+        Dictionary mapping plot type to list of saved paths
+    """
+    model_paths = {"heatmaps": [], "distributions": [], "comparisons": [], "reports": []}
+    clean_id = model_id.replace(":", "_").replace("/", "_")
+    
+    # Dashboard (all per-model panels in one figure)
+    use_dashboard = dashboard and len(model_metrics) > 0
+    if use_dashboard:
+        path = plots_dir / f"dashboard_{clean_id}.png"
+        plt.close(create_model_dashboard(
+            model_id, model_metrics, model_tasks, model_stability, save_path=path, show=show, pre_filtered=True
+        ))
+        model_paths["dashboards"] = [path]
+    
+    # Heatmap
+    elif len(model_metrics) > 0:
+        path = plots_dir / f"heatmap_{clean_id}.png"
+        plt.close(create_similarity_heatmap(model_metrics, model_id, save_path=path, show=show, pre_filtered=True))
+        model_paths["heatmaps"].append(path)
+        
+        # Distribution
+        path = plots_dir / f"distribution_{clean_id}.png"
+        plt.close(create_similarity_distribution(model_metrics, model_id, save_path=path, show=show, pre_filtered=True))
+        model_paths["distributions"].append(path)
+        
+        # Task type comparison
+        path = plots_dir / f"task_comparison_{clean_id}.png"
+        plt.close(create_task_type_comparison(model_metrics, model_id, save_path=path, show=show, pre_filtered=True))
+        model_paths["comparisons"].append(path)
+        
+        # Stability comparison
+        path = plots_dir / f"stability_{clean_id}.png"
+        plt.close(create_stability_comparison(
+            model_stability, model_metrics, model_id, save_path=path, show=show, pre_filtered=True
+        ))
+        model_paths["comparisons"].append(path)
+    
+    # Discrete task summary (a dashboard panel when a dashboard is drawn)
+    if len(model_tasks) > 0 and not use_dashboard:
+        path = plots_dir / f"discrete_summary_{clean_id}.png"
+        plt.close(create_discrete_task_summary(model_tasks, model_id, save_path=path, show=show, pre_filtered=True))
+        model_paths["comparisons"].append(path)
+    
+    # Summary table
+    summary = generate_summary_table(
+        model_metrics, model_tasks, model_stability, model_id, pre_filtered=True
+    )
+    if len(summary) > 0:
+        path = save_summary_table(summary, model_id, reports_dir)
+        model_paths["reports"].append(path)
+    
+    return model_paths
+
+
 def generate_all_plots(
     metrics_df: Optional[pd.DataFrame] = None,
     task_metrics_df: Optional[pd.DataFrame] = None,
     stability_df: Optional[pd.DataFrame] = None,
     plots_dir: Optional[Path] = None,
     reports_dir: Optional[Path] = None,
-    show: bool = False
+    show: bool = False,
+    max_workers: Optional[int] = 1,
+    dashboard: bool = False
 ) -> Dict[str, List[Path]]:
     """Generate all plots and save them.
     
+    When plots are only saved, rendering switches to the Agg backend for
+    the duration of the call, unless figures are already open; figures
+    the caller has open are never closed.
+    
     Args:
         metrics_df: Metrics DataFrame (loads if None)
         task_metrics_df: Task metrics DataFrame (loads if None)
@@ -504,6 +753,12 @@ def generate_all_plots(
         plots_dir: Directory for plots
         reports_dir: Directory for reports
         show: Whether to display plots
+        max_workers: Processes for per-model plots (1 = render in this
+            process, None = one per model up to the CPU count). Workers
+            re-import the src package, including torch, so a pool only
+            pays off for many models
+        dashboard: Save one multi-panel dashboard per model instead of
+            separate heatmap, distribution, comparison and discrete plots
         
     Returns:
         Dictionary mapping plot type to list of saved paths
@@ -521,58 +776,65 @@ def generate_all_plots(
     if stability_df is None:
         stability_df = load_stability()
     
-    saved_paths = {"heatmaps": [], "distributions": [], "comparisons": [], "reports": []}
-    
-    # Get unique models
-    models = set()
-    if len(metrics_df) > 0:
-        models.update(metrics_df["model_id"].unique())
-    if len(task_metrics_df) > 0:
-        models.update(task_metrics_df["model_id"].unique())
+    # Group and plot on integer category codes instead of strings
+    metrics_df = _categorize(metrics_df, CATEGORICAL_COLUMNS)
+    task_metrics_df = _categorize(task_metrics_df, CATEGORICAL_COLUMNS)
+    stability_df = _categorize(stability_df, CATEGORICAL_COLUMNS)
     
-    for model_id in models:
-        clean_id = model_id.replace(":", "_").replace("/", "_")
+    # Render off-screen when plots are only saved
+    with _headless_backend(not show):
+        setup_plot_style()
         
-        # Heatmap
-        if len(metrics_df[metrics_df["model_id"] == model_id]) > 0:
-            path = plots_dir / f"heatmap_{clean_id}.png"
-            create_similarity_heatmap(metrics_df, model_id, save_path=path, show=show)
-            saved_paths["heatmaps"].append(path)
-            
-            # Distribution
-            path = plots_dir / f"distribution_{clean_id}.png"
-            create_similarity_distribution(metrics_df, model_id, save_path=path, show=show)
-            saved_paths["distributions"].append(path)
-            
-            # Task type comparison
-            path = plots_dir / f"task_comparison_{clean_id}.png"
-            create_task_type_comparison(metrics_df, model_id, save_path=path, show=show)
-            saved_paths["comparisons"].append(path)
-            
-            # Stability comparison
-            path = plots_dir / f"stability_{clean_id}.png"
-            create_stability_comparison(stability_df, metrics_df, model_id, save_path=path, show=show)
-            saved_paths["comparisons"].append(path)
+        saved_paths = {"heatmaps": [], "distributions": [], "comparisons": [], "reports": []}
+        
+        # Get unique models (already known from the model_id categories)
+        models = []
+        for df in (metrics_df, task_metrics_df):
+            if len(df) > 0:
+                models += [m for m in df["model_id"].cat.categories if m not in models]
+        
+        # Split each frame by model once instead of filtering per plot
+        metrics_groups = _group_by_model(metrics_df)
+        task_groups = _group_by_model(task_metrics_df)
+        stability_groups = _group_by_model(stability_df)
+        
+        # Models missing from a frame share one empty slice
+        no_metrics, no_tasks, no_stability = metrics_df.iloc[0:0], task_metrics_df.iloc[0:0], stability_df.iloc[0:0]
+        jobs = [
+            (
+                model_id,
+                metrics_groups.get(model_id, no_metrics),
+                task_groups.get(model_id, no_tasks),
+                stability_groups.get(model_id, no_stability),
+                plots_dir,
+                reports_dir,
+                show,
+                dashboard
+            )
+            for model_id in models
+        ]
+        
+        # Per-model plots are independent; render them in worker processes
+        # if asked to, unless they have to be displayed
+        if max_workers is None:
+            max_workers = min(len(models), os.cpu_count() or 1)
+        if show or max_workers <= 1 or len(jobs) <= 1:
+            results = [_render_one_model(*job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_plot_worker) as pool:
+                results = list(pool.map(_render_one_model, *zip(*jobs)))
+        
+        for model_paths in results:
+            for plot_type, paths in model_paths.items():
+                saved_paths.setdefault(plot_type, []).extend(paths)
         
-        # Discrete task summary
-        if len(task_metrics_df[task_metrics_df["model_id"] == model_id]) > 0:
-            path = plots_dir / f"discrete_summary_{clean_id}.png"
-            create_discrete_task_summary(task_metrics_df, model_id, save_path=path, show=show)
+        # Model comparison (if multiple models)
+        if len(models) > 1 and len(metrics_df) > 0:
+            path = plots_dir / "model_comparison.png"
+            plt.close(create_model_comparison(metrics_df, save_path=path, show=show))
             saved_paths["comparisons"].append(path)
         
-        # Summary table
-        summary = generate_summary_table(metrics_df, task_metrics_df, stability_df, model_id)
-        if len(summary) > 0:
-            path = save_summary_table(summary, model_id, reports_dir)
-            saved_paths["reports"].append(path)
-    
-    # Model comparison (if multiple models)
-    if len(models) > 1 and len(metrics_df) > 0:
-        path = plots_dir / "model_comparison.png"
-        create_model_comparison(metrics_df, save_path=path, show=show)
-        saved_paths["comparisons"].append(path)
-    
-    return saved_paths
+        return saved_paths
 
 
 if __name__ == "__main__":
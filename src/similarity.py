@@ -5,26 +5,42 @@ This module computes pairwise cosine similarities between embeddings
 and aggregates them by language pair and task type.
 """
 
+import json
 import numpy as np
 import pandas as pd
+from collections import defaultdict
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
-from sklearn.metrics.pairwise import cosine_similarity as sklearn_cosine
+from typing import List, Dict, Any, Mapping, Optional, Tuple
+
+try:
+    from simsimd import cosine as _simsimd_cosine
+except ImportError:  # Optional: SIMD cosine kernels, falls back to numpy
+    _simsimd_cosine = None
 
 from .load_prompts import load_prompts, is_open_text_task, get_task_types
-from .infer_ollama import load_responses
-from .embed_labse import get_or_compute_embeddings, get_embedding_for_response, load_labse_model
+from .infer_ollama import DEFAULT_RESPONSES_FILE, load_responses
+from .embed_labse import EmbeddingStore, get_or_compute_embeddings, load_labse_model
+from .similarity_kernels import cosine_pairs
 
 
 # Default paths
 DEFAULT_DATA_DIR = Path(__file__).parent.parent / "data"
 DEFAULT_METRICS_FILE = DEFAULT_DATA_DIR / "metrics.csv"
-DEFAULT_STABILITY_FILE = DEFAULT_DATA_DIR / "stability.csv"
+# Parquet working copy (read back by compute_task_metrics); stability.csv is
+# still exported next to it for reading by hand
+DEFAULT_STABILITY_FILE = DEFAULT_DATA_DIR / "stability.parquet"
 
 
 # Language pairs for cross-lingual comparison
 LANGUAGE_PAIRS = [("EN", "DE"), ("EN", "TR"), ("DE", "TR")]
 
+# Prompt languages, in the order used for stability rows
+LANGUAGES = ["EN", "DE", "TR"]
+
+# compute_all_metrics results already produced in this process, keyed by
+# (responses file, metrics file, stability file, responses signature)
+_METRICS_CACHE: Dict[Tuple, Tuple[pd.DataFrame, pd.DataFrame]] = {}
+
 
 def cosine_similarity(emb1: np.ndarray, emb2: np.ndarray) -> float:
     """Compute cosine similarity between two embeddings.
@@ -36,24 +52,104 @@ def cosine_similarity(emb1: np.ndarray, emb2: np.ndarray) -> float:
     Returns:
         Cosine similarity value between -1 and 1
     """
-    # Reshape for sklearn
-    e1 = emb1.reshape(1, -1)
-    e2 = emb2.reshape(1, -1)
-    return float(sklearn_cosine(e1, e2)[0, 0])
+    if _simsimd_cosine is not None:
+        # simsimd returns the cosine distance
+        e1 = np.ascontiguousarray(emb1, dtype=np.float32)
+        e2 = np.ascontiguousarray(emb2, dtype=np.float32)
+        return 1.0 - float(_simsimd_cosine(e1, e2))
+    
+    return float(np.dot(emb1, emb2) / np.sqrt(np.vdot(emb1, emb1) * np.vdot(emb2, emb2)))
+
+
+def cosine_similarity_normalized(emb1: np.ndarray, emb2: np.ndarray) -> float:
+    """Compute cosine similarity between two unit-length embeddings.
+    
+    Args:
+        emb1: First L2-normalized embedding vector
+        emb2: Second L2-normalized embedding vector
+        
+    Returns:
+        Cosine similarity value between -1 and 1
+    """
+    return float(emb1 @ emb2)
+
+
+def normalize_embeddings(embeddings: Mapping[str, np.ndarray]) -> EmbeddingStore:
+    """Scale every embedding to unit L2 norm (zero vectors are left as-is).
+    
+    Args:
+        embeddings: EmbeddingStore or dictionary mapping keys to embeddings
+        
+    Returns:
+        New EmbeddingStore with the same keys, whose matrix is a C-contiguous
+        float32 array of normalized rows
+    """
+    store = EmbeddingStore.from_dict(embeddings)
+    mat = np.ascontiguousarray(store.mat, dtype=np.float32)
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return EmbeddingStore(mat / norms, store.index)
+
+
+def _embedding_key(model_id: str, prompt_id: int, language: str, run_id: int) -> str:
+    """Embedding key of a response, "{model_id}_{prompt_id}_{language}_{run_id}"."""
+    return f"{model_id}_{prompt_id}_{language}_{run_id}"
+
+
+def _embedding_row(
+    embeddings: EmbeddingStore,
+    model_id: str,
+    prompt_id: int,
+    language: str,
+    run_id: int
+) -> Optional[int]:
+    """Row of a response in ``embeddings.mat``, or None if it has no embedding."""
+    return embeddings.index.get(_embedding_key(model_id, prompt_id, language, run_id))
+
+
+def _cross_lingual_pairs(rows: Mapping[str, int]) -> List[Tuple[str, int, int]]:
+    """(pair name, row1, row2) for each of LANGUAGE_PAIRS with both languages in rows."""
+    return [
+        (f"{lang1}-{lang2}", rows[lang1], rows[lang2])
+        for lang1, lang2 in LANGUAGE_PAIRS
+        if lang1 in rows and lang2 in rows
+    ]
+
+
+def _stability_pairs(
+    run1_rows: Mapping[str, int],
+    run2_rows: Mapping[str, int]
+) -> List[Tuple[str, int, int]]:
+    """(language, run1 row, run2 row) for each language present in both runs."""
+    return [
+        (language, run1_rows[language], run2_rows[language])
+        for language in LANGUAGES
+        if language in run1_rows and language in run2_rows
+    ]
+
+
+def _normalized_rows(
+    embeddings: Mapping[str, np.ndarray],
+    keys: Dict[Any, str]
+) -> Tuple[np.ndarray, Dict[Any, int]]:
+    """Normalized matrix of the embeddings found for keys, and label -> row."""
+    found = {label: key for label, key in keys.items() if key in embeddings}
+    store = normalize_embeddings({key: embeddings[key] for key in found.values()})
+    return store.mat, {label: store.index[key] for label, key in found.items()}
 
 
 def compute_cross_lingual_similarity(
-    responses: List[Dict[str, Any]],
-    embeddings: Dict[str, np.ndarray],
+    embeddings: Mapping[str, np.ndarray],
     model_id: str,
     prompt_id: int,
     run_id: int
 ) -> Dict[str, float]:
     """Compute cross-lingual similarities for a prompt and run.
     
+    Uses the same pairing and cosine_pairs kernel as compute_all_metrics.
+    
     Args:
-        responses: List of response records
-        embeddings: Dictionary mapping keys to embeddings
+        embeddings: EmbeddingStore or dictionary mapping keys to embeddings
         model_id: Model to filter by
         prompt_id: Prompt to analyze
         run_id: Run number to compare
@@ -61,30 +157,27 @@ def compute_cross_lingual_similarity(
     Returns:
         Dictionary: {"EN-DE": sim, "EN-TR": sim, "DE-TR": sim}
     """
-    result = {}
-    
-    for lang1, lang2 in LANGUAGE_PAIRS:
-        emb1 = get_embedding_for_response(model_id, prompt_id, lang1, run_id, embeddings)
-        emb2 = get_embedding_for_response(model_id, prompt_id, lang2, run_id, embeddings)
-        
-        if emb1 is not None and emb2 is not None:
-            result[f"{lang1}-{lang2}"] = cosine_similarity(emb1, emb2)
-    
-    return result
+    mat, rows = _normalized_rows(embeddings, {
+        language: _embedding_key(model_id, prompt_id, language, run_id)
+        for language in LANGUAGES
+    })
+    pairs = _cross_lingual_pairs(rows)
+    sims = cosine_pairs(mat, [p[1] for p in pairs], [p[2] for p in pairs])
+    return {name: float(sim) for (name, _, _), sim in zip(pairs, sims)}
 
 
 def compute_intra_language_stability(
-    responses: List[Dict[str, Any]],
-    embeddings: Dict[str, np.ndarray],
+    embeddings: Mapping[str, np.ndarray],
     model_id: str,
     prompt_id: int,
     language: str
 ) -> Optional[float]:
     """Compute intra-language stability (run1 vs run2) for open-text tasks.
     
+    Uses the same pairing and cosine_pairs kernel as compute_all_metrics.
+    
     Args:
-        responses: List of response records
-        embeddings: Dictionary mapping keys to embeddings
+        embeddings: EmbeddingStore or dictionary mapping keys to embeddings
         model_id: Model to filter by
         prompt_id: Prompt to analyze
         language: Language code
@@ -92,28 +185,47 @@ def compute_intra_language_stability(
     Returns:
         Cosine similarity between run1 and run2, or None if not available
     """
-    emb1 = get_embedding_for_response(model_id, prompt_id, language, 1, embeddings)
-    emb2 = get_embedding_for_response(model_id, prompt_id, language, 2, embeddings)
-    
-    if emb1 is not None and emb2 is not None:
-        return cosine_similarity(emb1, emb2)
-    
-    return None
+    mat, rows = _normalized_rows(embeddings, {
+        run_id: _embedding_key(model_id, prompt_id, language, run_id) for run_id in (1, 2)
+    })
+    if 1 not in rows or 2 not in rows:
+        return None
+    return float(cosine_pairs(mat, [rows[1]], [rows[2]])[0])
+
+
+def _responses_signature(responses_file: Path) -> Optional[List[int]]:
+    """[mtime_ns, size] of the responses file, or None if it does not exist."""
+    if not responses_file.exists():
+        return None
+    stat = responses_file.stat()
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _signature_path(metrics_file: Path) -> Path:
+    """Sidecar recording which responses file state metrics_file was computed from."""
+    return metrics_file.with_suffix(".sig")
 
 
 def compute_all_metrics(
     responses_file: Optional[Path] = None,
     metrics_file: Optional[Path] = None,
     stability_file: Optional[Path] = None,
-    show_progress: bool = True
+    show_progress: bool = True,
+    use_cache: bool = True,
+    export_csv: bool = True
 ) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """Compute all metrics for open-text tasks.
     
+    If responses.jsonl is unchanged (same mtime and size) since the saved
+    metrics were written, they are loaded instead of recomputed.
+    
     Args:
         responses_file: Path to responses.jsonl
         metrics_file: Path to save metrics.csv
-        stability_file: Path to save stability.csv
+        stability_file: Path to save stability metrics (.parquet or .csv)
         show_progress: Show progress
+        use_cache: Reuse saved metrics for an unchanged responses file
+        export_csv: Also write a .csv copy of a Parquet stability file
         
     Returns:
         Tuple of (metrics_df, stability_df)
@@ -122,6 +234,29 @@ def compute_all_metrics(
         metrics_file = DEFAULT_METRICS_FILE
     if stability_file is None:
         stability_file = DEFAULT_STABILITY_FILE
+    if responses_file is None:
+        responses_file = DEFAULT_RESPONSES_FILE
+    
+    # Reuse earlier results if responses.jsonl has not changed since
+    signature = _responses_signature(responses_file)
+    sig_file = _signature_path(metrics_file)
+    cache_key = (str(responses_file), str(metrics_file), str(stability_file), tuple(signature or ()))
+    
+    if use_cache and signature is not None:
+        if cache_key in _METRICS_CACHE:
+            metrics_df, stability_df = _METRICS_CACHE[cache_key]
+            return metrics_df.copy(), stability_df.copy()
+        
+        if (sig_file.exists() and metrics_file.exists() and stability_file.exists()
+                and json.loads(sig_file.read_text()) == signature):
+            metrics_df = load_metrics(metrics_file)
+            stability_df = load_stability(stability_file)
+            # compute_task_metrics may have appended discrete rows since
+            stability_df = stability_df[stability_df["stability_type"] == "open_text_cosine"].reset_index(drop=True)
+            _METRICS_CACHE[cache_key] = (metrics_df, stability_df)
+            if show_progress:
+                print(f"Responses unchanged, loaded metrics from {metrics_file}")
+            return metrics_df.copy(), stability_df.copy()
     
     # Load responses
     responses = load_responses(responses_file)
@@ -131,7 +266,8 @@ def compute_all_metrics(
         return pd.DataFrame(), pd.DataFrame()
     
     # Filter to open-text tasks only
-    open_text_responses = [r for r in responses if is_open_text_task(r["task_type"])]
+    open_text_types = {t for t in {r["task_type"] for r in responses} if is_open_text_task(t)}
+    open_text_responses = [r for r in responses if r["task_type"] in open_text_types]
     
     if not open_text_responses:
         print("No open-text responses found!")
@@ -143,73 +279,84 @@ def compute_all_metrics(
     # Load model and compute embeddings
     model = load_labse_model()
     embeddings = get_or_compute_embeddings(open_text_responses, model=model, show_progress=show_progress)
+    embeddings = normalize_embeddings(embeddings)
     
-    # Get unique combinations
-    models = sorted(set(r["model_id"] for r in open_text_responses))
+    # Task type of each open-text prompt
     prompts_df = load_prompts(prepend_control_line=False)
-    open_text_prompts = prompts_df[prompts_df["task_type"].apply(is_open_text_task)]
-    prompt_ids = sorted(open_text_prompts["prompt_id"].unique())
-    
-    # Compute cross-lingual metrics
+    open_text_prompts = prompts_df[prompts_df["task_type"].isin(
+        [t for t in prompts_df["task_type"].unique() if is_open_text_task(t)]
+    )]
+    prompt_to_task = dict(zip(open_text_prompts["prompt_id"], open_text_prompts["task_type"]))
+    
+    # One pass over the responses: (model, prompt, run) -> {language: embedding row}
+    by_key: Dict[Tuple[str, int, int], Dict[str, int]] = defaultdict(dict)
+    for r in open_text_responses:
+        if r["prompt_id"] not in prompt_to_task or r["run_id"] not in (1, 2):
+            continue
+        row = _embedding_row(embeddings, r["model_id"], r["prompt_id"], r["language"], r["run_id"])
+        if row is not None:
+            by_key[(r["model_id"], r["prompt_id"], r["run_id"])][r["language"]] = row
+    
+    # Collect the embedding row pairs to compare for cross-lingual metrics
     metrics_rows = []
-    for model_id in models:
-        for prompt_id in prompt_ids:
-            task_type = open_text_prompts[open_text_prompts["prompt_id"] == prompt_id]["task_type"].iloc[0]
-            
-            for run_id in [1, 2]:
-                sims = compute_cross_lingual_similarity(
-                    responses, embeddings, model_id, prompt_id, run_id
-                )
-                
-                for pair, sim in sims.items():
-                    metrics_rows.append({
-                        "model_id": model_id,
-                        "prompt_id": prompt_id,
-                        "task_type": task_type,
-                        "pair": pair,
-                        "run_id": run_id,
-                        "cosine_similarity": sim,
-                        "flag_low_similarity": False  # Will be updated below
-                    })
+    metric_pairs = []
+    for (model_id, prompt_id, run_id), rows in sorted(by_key.items()):
+        for pair, row1, row2 in _cross_lingual_pairs(rows):
+            metrics_rows.append({
+                "model_id": model_id,
+                "prompt_id": prompt_id,
+                "task_type": prompt_to_task[prompt_id],
+                "pair": pair,
+                "run_id": run_id,
+                "cosine_similarity": np.nan,  # Filled in below
+                "flag_low_similarity": False  # Will be updated below
+            })
+            metric_pairs.append((row1, row2))
+    
+    # ... and for intra-language stability
+    stability_rows = []
+    stability_pairs = []
+    for (model_id, prompt_id, run_id), run1_rows in sorted(by_key.items()):
+        run2_rows = by_key.get((model_id, prompt_id, 2))
+        if run_id != 1 or run2_rows is None:
+            continue
+        
+        for language, row1, row2 in _stability_pairs(run1_rows, run2_rows):
+            stability_rows.append({
+                "model_id": model_id,
+                "prompt_id": prompt_id,
+                "task_type": prompt_to_task[prompt_id],
+                "language": language,
+                "stability_type": "open_text_cosine",
+                "run_id_a": 1,
+                "run_id_b": 2,
+                "stability_value": np.nan  # Filled in below
+            })
+            stability_pairs.append((row1, row2))
+    
+    # Score every pair in one kernel call
+    pairs = np.array(metric_pairs + stability_pairs, dtype=np.int64).reshape(-1, 2)
+    sims = cosine_pairs(embeddings.mat, pairs[:, 0], pairs[:, 1])
     
     metrics_df = pd.DataFrame(metrics_rows)
+    stability_df = pd.DataFrame(stability_rows)
+    if metric_pairs:
+        metrics_df["cosine_similarity"] = sims[:len(metric_pairs)]
+    if stability_pairs:
+        stability_df["stability_value"] = sims[len(metric_pairs):]
     
     # Flag bottom 10% per model
     if len(metrics_df) > 0:
-        for model_id in models:
-            mask = metrics_df["model_id"] == model_id
-            threshold = metrics_df.loc[mask, "cosine_similarity"].quantile(0.10)
-            metrics_df.loc[mask & (metrics_df["cosine_similarity"] <= threshold), "flag_low_similarity"] = True
-    
-    # Compute intra-language stability
-    stability_rows = []
-    for model_id in models:
-        for prompt_id in prompt_ids:
-            task_type = open_text_prompts[open_text_prompts["prompt_id"] == prompt_id]["task_type"].iloc[0]
-            
-            for language in ["EN", "DE", "TR"]:
-                stability = compute_intra_language_stability(
-                    responses, embeddings, model_id, prompt_id, language
-                )
-                
-                if stability is not None:
-                    stability_rows.append({
-                        "model_id": model_id,
-                        "prompt_id": prompt_id,
-                        "task_type": task_type,
-                        "language": language,
-                        "stability_type": "open_text_cosine",
-                        "run_id_a": 1,
-                        "run_id_b": 2,
-                        "stability_value": stability
-                    })
-    
-    stability_df = pd.DataFrame(stability_rows)
+        threshold = metrics_df.groupby("model_id")["cosine_similarity"].transform("quantile", 0.10)
+        metrics_df["flag_low_similarity"] = metrics_df["cosine_similarity"] <= threshold
     
     # Save files
     metrics_file.parent.mkdir(parents=True, exist_ok=True)
     metrics_df.to_csv(metrics_file, index=False)
-    stability_df.to_csv(stability_file, index=False)
+    save_stability(stability_df, stability_file, export_csv=export_csv)
+    if signature is not None:
+        sig_file.write_text(json.dumps(signature))
+        _METRICS_CACHE[cache_key] = (metrics_df.copy(), stability_df.copy())
     
     if show_progress:
         print(f"Saved metrics to {metrics_file}")
@@ -237,10 +384,14 @@ def load_metrics(metrics_file: Optional[Path] = None) -> pd.DataFrame:
 
 
 def load_stability(stability_file: Optional[Path] = None) -> pd.DataFrame:
-    """Load stability metrics from CSV.
+    """Load stability metrics from Parquet or CSV.
+    
+    If a .parquet file does not exist yet but the .csv export next to it
+    does (checkouts from before the Parquet switch), the CSV is migrated to
+    Parquet once; from then on the Parquet file is the only one read.
     
     Args:
-        stability_file: Path to stability.csv
+        stability_file: Path to stability.parquet or stability.csv
         
     Returns:
         DataFrame with stability metrics
@@ -248,12 +399,49 @@ def load_stability(stability_file: Optional[Path] = None) -> pd.DataFrame:
     if stability_file is None:
         stability_file = DEFAULT_STABILITY_FILE
     
+    if stability_file.suffix == ".parquet":
+        if stability_file.exists():
+            return pd.read_parquet(stability_file)
+        
+        legacy_csv = stability_file.with_suffix(".csv")
+        if not legacy_csv.exists():
+            return pd.DataFrame()
+        
+        # Migrate to Parquet so the CSV export is never read back again
+        stability_df = pd.read_csv(legacy_csv)
+        save_stability(stability_df, stability_file, export_csv=False)
+        return stability_df
+    
     if not stability_file.exists():
         return pd.DataFrame()
     
     return pd.read_csv(stability_file)
 
 
+def save_stability(
+    stability_df: pd.DataFrame,
+    stability_file: Optional[Path] = None,
+    export_csv: bool = True
+) -> None:
+    """Save stability metrics to Parquet or CSV, by file suffix.
+    
+    Args:
+        stability_df: Stability DataFrame
+        stability_file: Path to stability.parquet or stability.csv
+        export_csv: Also write a .csv copy of a Parquet file
+    """
+    if stability_file is None:
+        stability_file = DEFAULT_STABILITY_FILE
+    
+    stability_file.parent.mkdir(parents=True, exist_ok=True)
+    if stability_file.suffix == ".parquet":
+        stability_df.to_parquet(stability_file, index=False)
+        if export_csv:
+            stability_df.to_csv(stability_file.with_suffix(".csv"), index=False)
+    else:
+        stability_df.to_csv(stability_file, index=False)
+
+
 def aggregate_by_language_pair(
     metrics_df: pd.DataFrame,
     model_id: Optional[str] = None
@@ -320,6 +508,23 @@ def aggregate_by_pair_and_task(
     }).round(4)
 
 
+def response_texts_by_key(responses: List[Dict[str, Any]]) -> pd.Series:
+    """Index response texts by (model_id, prompt_id, language, run_id).
+    
+    Args:
+        responses: List of response records
+        
+    Returns:
+        Series of response texts with a unique 4-level MultiIndex
+        (the last record wins for duplicate keys)
+    """
+    index = pd.MultiIndex.from_tuples(
+        [(r["model_id"], r["prompt_id"], r["language"], r["run_id"]) for r in responses]
+    )
+    texts = pd.Series([r["response_text"] for r in responses], index=index)
+    return texts[~index.duplicated(keep="last")]
+
+
 def get_flagged_examples(
     metrics_df: pd.DataFrame,
     responses: Optional[List[Dict[str, Any]]] = None,
@@ -335,29 +540,29 @@ def get_flagged_examples(
     Returns:
         DataFrame with flagged examples
     """
-    df = metrics_df[metrics_df["flag_low_similarity"]].copy()
-    
+    mask = metrics_df["flag_low_similarity"].astype(bool)
     if model_id:
-        df = df[df["model_id"] == model_id]
-    
-    if responses:
-        # Add response texts
-        resp_dict = {}
-        for r in responses:
-            key = (r["model_id"], r["prompt_id"], r["language"], r["run_id"])
-            resp_dict[key] = r["response_text"]
-        
-        def get_responses(row):
-            texts = {}
-            pair = row["pair"]
-            lang1, lang2 = pair.split("-")
-            for lang in [lang1, lang2]:
-                key = (row["model_id"], row["prompt_id"], lang, row["run_id"])
-                texts[f"response_{lang}"] = resp_dict.get(key, "")
-            return pd.Series(texts)
+        mask &= metrics_df["model_id"] == model_id
+    df = metrics_df[mask].copy()
+    
+    if responses and len(df) > 0:
+        # Look up the texts for both languages of every pair in one reindex
+        texts = response_texts_by_key(responses)
+        langs = df["pair"].str.split("-", expand=True)
+        lang1, lang2 = langs[0].to_numpy(), langs[1].to_numpy()
+        keys = pd.MultiIndex.from_arrays([
+            np.tile(df["model_id"].to_numpy(), 2),
+            np.tile(df["prompt_id"].to_numpy(), 2),
+            np.concatenate([lang1, lang2]),
+            np.tile(df["run_id"].to_numpy(), 2)
+        ])
+        found = texts.reindex(keys).fillna("").to_numpy().reshape(2, len(df))
         
-        response_cols = df.apply(get_responses, axis=1)
-        df = pd.concat([df, response_cols], axis=1)
+        # Languages outside a row's pair stay NaN
+        for lang in ["EN", "DE", "TR"]:
+            in_lang1, in_lang2 = lang1 == lang, lang2 == lang
+            if in_lang1.any() or in_lang2.any():
+                df[f"response_{lang}"] = np.where(in_lang1, found[0], np.where(in_lang2, found[1], np.nan))
     
     return df.sort_values("cosine_similarity")
 
@@ -0,0 +1,78 @@
+"""
+Batched cosine similarity kernels.
+
+This module scores many (row_i, row_j) pairs of an L2-normalized embedding
+matrix in a single call, using a numba-compiled loop when numba is
+installed and a vectorized numpy fallback otherwise.
+"""
+
+import numpy as np
+from typing import Optional, Sequence
+
+try:
+    from numba import njit, prange
+except ImportError:  # Optional: compiled kernel, falls back to numpy
+    njit = None
+
+
+def _cosine_pairs_numpy(
+    mat: np.ndarray,
+    i_idx: np.ndarray,
+    j_idx: np.ndarray,
+    out: np.ndarray
+) -> np.ndarray:
+    """Numpy fallback for cosine_pairs."""
+    out[:] = np.einsum("ij,ij->i", mat[i_idx], mat[j_idx])
+    return out
+
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True)
+    def _cosine_pairs_numba(mat, i_idx, j_idx, out):
+        for k in prange(i_idx.shape[0]):
+            a = mat[i_idx[k]]
+            b = mat[j_idx[k]]
+            dot = np.float32(0.0)
+            for d in range(mat.shape[1]):
+                dot += a[d] * b[d]
+            out[k] = dot
+        return out
+else:
+    _cosine_pairs_numba = None
+
+
+def cosine_pairs(
+    mat: np.ndarray,
+    i_idx: Sequence[int],
+    j_idx: Sequence[int],
+    out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Compute cosine similarities between selected rows of a matrix.
+    
+    Only the requested pairs are scored, so memory stays proportional to
+    the number of pairs rather than the full (n_rows, n_rows) matrix.
+    Rows must already be L2-normalized (see similarity.normalize_embeddings),
+    so each score is a plain dot product; all-zero rows score 0.0.
+    
+    Args:
+        mat: L2-normalized embedding matrix of shape (n_rows, embedding_dim);
+            scored in float32
+        i_idx: Row index of the first embedding of each pair
+        j_idx: Row index of the second embedding of each pair
+        out: Optional float64 array of len(i_idx) to write results into
+        
+    Returns:
+        Array of cosine similarities, one per pair
+    """
+    mat = np.ascontiguousarray(mat, dtype=np.float32)
+    i_idx = np.asarray(i_idx, dtype=np.int64)
+    j_idx = np.asarray(j_idx, dtype=np.int64)
+    if out is None:
+        out = np.empty(len(i_idx), dtype=np.float64)
+    
+    if len(i_idx) == 0:
+        return out
+    
+    if _cosine_pairs_numba is not None:
+        return _cosine_pairs_numba(mat, i_idx, j_idx, out)
+    return _cosine_pairs_numpy(mat, i_idx, j_idx, out)
@@ -6,19 +6,19 @@ responses and checks for cross-lingual and intra-language agreement.
 """
 
 import re
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
-from collections import defaultdict
 
 from .load_prompts import load_prompts, is_discrete_task
 from .infer_ollama import load_responses
+from .similarity import DEFAULT_STABILITY_FILE, load_stability, save_stability, response_texts_by_key
 
 
 # Default paths
 DEFAULT_DATA_DIR = Path(__file__).parent.parent / "data"
 DEFAULT_TASK_METRICS_FILE = DEFAULT_DATA_DIR / "task_metrics.csv"
-DEFAULT_STABILITY_FILE = DEFAULT_DATA_DIR / "stability.csv"
 
 
 # Expected answers for factual prompts (used for validation, not matching)
@@ -30,6 +30,39 @@ FACTUAL_EXPECTED = {
 }
 
 
+# Runs of whitespace, collapsed to a single space by normalize_text
+_WS_RE = re.compile(r"\s+")
+
+
+# Answer extraction rules per task type and prompt: (pattern, label) pairs
+# tried in order on normalized text. A label of None means "use the captured
+# group", upper-cased so reasoning letters come out as A/B/C.
+_ANSWER_RULES = {
+    "classification": {
+        5: [(re.compile(r"positive|positiv|olumlu"), "positive"),  # Sentiment: Positive/Negative
+            (re.compile(r"negative|negativ|olumsuz"), "negative")],
+        6: [(re.compile(r"disagree"), "disagree"),  # Agreement: Agree/Disagree
+            (re.compile(r"agree"), "agree")],
+        7: [(re.compile(r"request"), "request"),  # Intent: Request/Complaint
+            (re.compile(r"complaint"), "complaint")],
+        8: [(re.compile(r"informal"), "informal"),  # Formality: Formal/Informal
+            (re.compile(r"formal"), "formal")],
+    },
+    "reasoning": {
+        9: [(re.compile(r"\b([abc])\b", re.IGNORECASE), None)],  # Logic: A, B, or C (who is tallest)
+        10: [(re.compile(r"(\d+(?:\.\d+)?)\s*(?:km/h|km\/h)?"), None)],  # Math: speed in km/h
+        11: [(re.compile(r"(\d+)"), None)],  # Time: minutes (should be 90)
+        12: [(re.compile(r"\b([abc])\b", re.IGNORECASE), None)],  # Decision: A, B, or C (weather clothing)
+    },
+    "factual": {
+        13: [(re.compile(r"h2o|h₂o"), "H2O")],  # Water formula
+        14: [(re.compile(r"\b(19\d{2})\b"), None)],  # WWII end year
+        15: [(re.compile(r"ottawa"), "Ottawa")],  # Canada capital
+        16: [(re.compile(r"orwell"), "George Orwell")],  # 1984 author
+    },
+}
+
+
 def normalize_text(text: str) -> str:
     """Normalize text for comparison.
     
@@ -39,7 +72,16 @@ def normalize_text(text: str) -> str:
     Returns:
         Normalized lowercase text with extra whitespace removed
     """
-    return " ".join(text.lower().strip().split())
+    return _WS_RE.sub(" ", text.lower()).strip()
+
+
+def _match_rules(text: str, rules: List[Tuple[re.Pattern, Optional[str]]]) -> Optional[str]:
+    """Return the answer from the first matching (pattern, label) rule, or None."""
+    for pattern, label in rules:
+        match = pattern.search(text)
+        if match:
+            return label if label is not None else match.group(1).upper()
+    return None
 
 
 def extract_classification_label(
@@ -56,32 +98,7 @@ def extract_classification_label(
         Extracted label or None if not found
     """
     text = normalize_text(response_text)
-    
-    if prompt_id == 5:  # Sentiment: Positive/Negative
-        if "positive" in text or "positiv" in text or "olumlu" in text:
-            return "positive"
-        elif "negative" in text or "negativ" in text or "olumsuz" in text:
-            return "negative"
-    
-    elif prompt_id == 6:  # Agreement: Agree/Disagree
-        if "disagree" in text:
-            return "disagree"
-        elif "agree" in text:
-            return "agree"
-    
-    elif prompt_id == 7:  # Intent: Request/Complaint
-        if "request" in text:
-            return "request"
-        elif "complaint" in text:
-            return "complaint"
-    
-    elif prompt_id == 8:  # Formality: Formal/Informal
-        if "informal" in text:
-            return "informal"
-        elif "formal" in text:
-            return "formal"
-    
-    return None
+    return _match_rules(text, _ANSWER_RULES["classification"].get(prompt_id, []))
 
 
 def extract_reasoning_answer(
@@ -98,30 +115,7 @@ def extract_reasoning_answer(
         Extracted answer or None if not found
     """
     text = normalize_text(response_text)
-    
-    if prompt_id == 9:  # Logic: A, B, or C (who is tallest)
-        match = re.search(r'\b([abc])\b', text, re.IGNORECASE)
-        if match:
-            return match.group(1).upper()
-    
-    elif prompt_id == 10:  # Math: speed in km/h
-        # Look for number followed by optional km/h
-        match = re.search(r'(\d+(?:\.\d+)?)\s*(?:km/h|km\/h)?', text)
-        if match:
-            return match.group(1)
-    
-    elif prompt_id == 11:  # Time: minutes
-        # Look for number (should be 90)
-        match = re.search(r'(\d+)', text)
-        if match:
-            return match.group(1)
-    
-    elif prompt_id == 12:  # Decision: A, B, or C (weather clothing)
-        match = re.search(r'\b([abc])\b', text, re.IGNORECASE)
-        if match:
-            return match.group(1).upper()
-    
-    return None
+    return _match_rules(text, _ANSWER_RULES["reasoning"].get(prompt_id, []))
 
 
 def extract_factual_answer(
@@ -138,26 +132,7 @@ def extract_factual_answer(
         Extracted answer or None if not found
     """
     text = normalize_text(response_text)
-    
-    if prompt_id == 13:  # Water formula
-        if "h2o" in text or "h₂o" in text:
-            return "H2O"
-    
-    elif prompt_id == 14:  # WWII end year
-        match = re.search(r'\b(19\d{2})\b', text)
-        if match:
-            return match.group(1)
-    
-    elif prompt_id == 15:  # Canada capital
-        # Look for Ottawa in various forms
-        if "ottawa" in text:
-            return "Ottawa"
-    
-    elif prompt_id == 16:  # 1984 author
-        if "orwell" in text:
-            return "George Orwell"
-    
-    return None
+    return _match_rules(text, _ANSWER_RULES["factual"].get(prompt_id, []))
 
 
 def extract_answer(
@@ -184,6 +159,38 @@ def extract_answer(
     return None
 
 
+def extract_answers(responses_df: pd.DataFrame) -> pd.Series:
+    """Vectorized ``extract_answer`` over a DataFrame of responses.
+    
+    Args:
+        responses_df: DataFrame with response_text, task_type and prompt_id columns
+        
+    Returns:
+        Series of extracted answers (None where nothing was found),
+        aligned with responses_df's index
+    """
+    text = (
+        responses_df["response_text"].astype(str)
+        .str.lower().str.replace(_WS_RE, " ", regex=True).str.strip()
+    )
+    answers = pd.Series(None, index=responses_df.index, dtype=object)
+    
+    for (task_type, prompt_id), group in text.groupby(
+        [responses_df["task_type"], responses_df["prompt_id"]], sort=False
+    ):
+        rules = _ANSWER_RULES.get(task_type, {}).get(prompt_id, [])
+        found = pd.Series(None, index=group.index, dtype=object)
+        for pattern, label in rules:
+            if label is None:
+                hits = group.str.extract(pattern, expand=False).str.upper()
+            else:
+                hits = pd.Series(np.where(group.str.contains(pattern), label, None), index=group.index)
+            found = found.where(found.notna(), hits.astype(object))
+        answers.loc[group.index] = found
+    
+    return answers.where(answers.notna(), None)
+
+
 def check_cross_lingual_match(
     answers: Dict[str, Optional[str]]
 ) -> Tuple[str, Dict[str, Optional[str]]]:
@@ -213,15 +220,17 @@ def compute_task_metrics(
     responses_file: Optional[Path] = None,
     task_metrics_file: Optional[Path] = None,
     stability_file: Optional[Path] = None,
-    show_progress: bool = True
+    show_progress: bool = True,
+    export_csv: bool = True
 ) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """Compute task-aware metrics for discrete-answer tasks.
     
     Args:
         responses_file: Path to responses.jsonl
         task_metrics_file: Path to save task_metrics.csv
-        stability_file: Path to stability.csv (will be appended)
+        stability_file: Path to stability.parquet or .csv (will be appended)
         show_progress: Show progress
+        export_csv: Also write a .csv copy of a Parquet stability file
         
     Returns:
         Tuple of (task_metrics_df, stability_df)
@@ -239,7 +248,8 @@ def compute_task_metrics(
         return pd.DataFrame(), pd.DataFrame()
     
     # Filter to discrete-answer tasks only
-    discrete_responses = [r for r in responses if is_discrete_task(r["task_type"])]
+    discrete_types = {t for t in {r["task_type"] for r in responses} if is_discrete_task(t)}
+    discrete_responses = [r for r in responses if r["task_type"] in discrete_types]
     
     if not discrete_responses:
         print("No discrete-answer responses found!")
@@ -248,81 +258,61 @@ def compute_task_metrics(
     if show_progress:
         print(f"Processing {len(discrete_responses)} discrete-answer responses...")
     
-    # Organize responses by model, prompt, run, language
-    organized = defaultdict(lambda: defaultdict(lambda: defaultdict(dict)))
-    for r in discrete_responses:
-        key = (r["model_id"], r["prompt_id"], r["task_type"])
-        organized[key][r["run_id"]][r["language"]] = r["response_text"]
-    
-    # Compute cross-lingual metrics
-    task_metrics_rows = []
-    
-    for (model_id, prompt_id, task_type), runs_data in organized.items():
-        for run_id, lang_responses in runs_data.items():
-            # Extract answers for each language
-            answers = {}
-            for lang, response_text in lang_responses.items():
-                answers[lang] = extract_answer(response_text, task_type, prompt_id)
-            
-            # Check cross-lingual agreement
-            result, extracted = check_cross_lingual_match(answers)
-            
-            task_metrics_rows.append({
-                "model_id": model_id,
-                "prompt_id": prompt_id,
-                "task_type": task_type,
-                "check_type": task_type,
-                "run_id": run_id,
-                "result": result,
-                "key_en": extracted.get("EN"),
-                "key_de": extracted.get("DE"),
-                "key_tr": extracted.get("TR")
-            })
-    
-    task_metrics_df = pd.DataFrame(task_metrics_rows)
-    
-    # Compute intra-language stability (run1 vs run2)
-    stability_rows = []
-    
-    for (model_id, prompt_id, task_type), runs_data in organized.items():
-        if 1 in runs_data and 2 in runs_data:
-            for language in ["EN", "DE", "TR"]:
-                if language in runs_data[1] and language in runs_data[2]:
-                    answer1 = extract_answer(runs_data[1][language], task_type, prompt_id)
-                    answer2 = extract_answer(runs_data[2][language], task_type, prompt_id)
-                    
-                    if answer1 is not None and answer2 is not None:
-                        stability_value = 1 if answer1 == answer2 else 0
-                    else:
-                        stability_value = None
-                    
-                    if stability_value is not None:
-                        stability_rows.append({
-                            "model_id": model_id,
-                            "prompt_id": prompt_id,
-                            "task_type": task_type,
-                            "language": language,
-                            "stability_type": "discrete_match",
-                            "run_id_a": 1,
-                            "run_id_b": 2,
-                            "stability_value": stability_value
-                        })
-    
-    stability_df = pd.DataFrame(stability_rows)
+    # Extract every answer up front (the last record wins for duplicate keys)
+    responses_df = pd.DataFrame(discrete_responses)
+    responses_df["answer"] = extract_answers(responses_df)
+    responses_df = responses_df.drop_duplicates(
+        ["model_id", "prompt_id", "task_type", "run_id", "language"], keep="last"
+    )
+    
+    # Compute cross-lingual metrics: one row per (model, prompt, run) with
+    # the answer in each language as a column
+    answers = responses_df.pivot(
+        index=["model_id", "prompt_id", "task_type", "run_id"], columns="language", values="answer"
+    ).reindex(columns=["EN", "DE", "TR"])
+    answers = answers.astype(object).where(answers.notna(), None)
+    
+    valid = answers.notna().sum(axis=1)
+    n_unique = answers.nunique(axis=1)
+    keys = answers.index.to_frame(index=False)
+    
+    task_metrics_df = pd.DataFrame({
+        "model_id": keys["model_id"],
+        "prompt_id": keys["prompt_id"],
+        "task_type": keys["task_type"],
+        "check_type": keys["task_type"],
+        "run_id": keys["run_id"],
+        "result": np.where(valid < 2, "uncertain", np.where(n_unique == 1, "match", "mismatch")),
+        "key_en": answers["EN"].to_numpy(),
+        "key_de": answers["DE"].to_numpy(),
+        "key_tr": answers["TR"].to_numpy()
+    })
+    
+    # Compute intra-language stability (run1 vs run2): one row per
+    # (model, prompt, language) where both runs yielded an answer
+    runs = responses_df.pivot(
+        index=["model_id", "prompt_id", "task_type", "language"], columns="run_id", values="answer"
+    ).reindex(columns=[1, 2]).dropna()
+    
+    stability_df = runs.index.to_frame(index=False)
+    stability_df["stability_type"] = "discrete_match"
+    stability_df["run_id_a"] = 1
+    stability_df["run_id_b"] = 2
+    stability_df["stability_value"] = (runs[1] == runs[2]).astype(int).to_numpy()
     
     # Save task metrics
     task_metrics_file.parent.mkdir(parents=True, exist_ok=True)
     task_metrics_df.to_csv(task_metrics_file, index=False)
     
     # Append stability to existing file or create new
-    if stability_file.exists():
-        existing_stability = pd.read_csv(stability_file)
+    existing_stability = load_stability(stability_file)
+    if len(existing_stability) > 0:
         # Remove any existing discrete_match entries to avoid duplicates
         existing_stability = existing_stability[existing_stability["stability_type"] != "discrete_match"]
         combined_stability = pd.concat([existing_stability, stability_df], ignore_index=True)
-        combined_stability.to_csv(stability_file, index=False)
+        save_stability(combined_stability, stability_file, export_csv=export_csv)
     else:
-        stability_df.to_csv(stability_file, index=False)
+        save_stability(stability_df, stability_file, export_csv=export_csv)
     
     if show_progress:
         print(f"Saved task metrics to {task_metrics_file}")
@@ -430,27 +420,24 @@ def get_mismatched_examples(
     Returns:
         DataFrame with mismatched examples
     """
-    df = task_metrics_df[task_metrics_df["result"] == "mismatch"].copy()
-    
+    mask = task_metrics_df["result"] == "mismatch"
     if model_id:
-        df = df[df["model_id"] == model_id]
+        mask &= task_metrics_df["model_id"] == model_id
+    df = task_metrics_df[mask].copy()
     
     if responses:
-        # Add response texts
-        resp_dict = {}
-        for r in responses:
-            key = (r["model_id"], r["prompt_id"], r["language"], r["run_id"])
-            resp_dict[key] = r["response_text"]
-        
-        def get_responses(row):
-            texts = {}
-            for lang in ["EN", "DE", "TR"]:
-                key = (row["model_id"], row["prompt_id"], lang, row["run_id"])
-                texts[f"response_{lang}"] = resp_dict.get(key, "")
-            return pd.Series(texts)
-        
-        response_cols = df.apply(get_responses, axis=1)
-        df = pd.concat([df, response_cols], axis=1)
+        # Add response texts, all three languages in one reindex
+        languages = ["EN", "DE", "TR"]
+        texts = response_texts_by_key(responses)
+        keys = pd.MultiIndex.from_arrays([
+            np.tile(df["model_id"].to_numpy(), len(languages)),
+            np.tile(df["prompt_id"].to_numpy(), len(languages)),
+            np.repeat(languages, len(df)),
+            np.tile(df["run_id"].to_numpy(), len(languages))
+        ])
+        found = texts.reindex(keys).fillna("").to_numpy().reshape(len(languages), len(df))
+        for lang, lang_texts in zip(languages, found):
+            df[f"response_{lang}"] = lang_texts
     
     return df
 